@@ -9,6 +9,8 @@ from .group_funcs import (
 from .groups import (
     Groups,
     NestedGroups,
+    LazyNestedGroups,
+    EncodedGroups,
     GroupCollection,
 )
 
@@ -17,18 +19,28 @@ from .groups import (
 from .typed_collections import (
     tlist, 
     tset,
+    tview,
+    cowlist,
 )
 from .group_funcs_lowlevel import (
     _groupby_multi, 
     _groupby,
+    _groupby_multi_batched,
+    _groupby_batched,
 )
 
 from . import chain
+from . import aggregators
+from .shared import SharedCollection
+from .pivot import Pivot
+from .builder import GroupBuilder
+from .keys import KeyCodec
 
 __all__ = [
     "group", "groupby_multi", "groupby",
-    "Groups", "NestedGroups", "GroupCollection", 
-    "tlist", "tset",
-    "chain",
+    "Groups", "NestedGroups", "LazyNestedGroups", "EncodedGroups", "GroupCollection", 
+    "tlist", "tset", "tview", "cowlist",
+    "SharedCollection", "Pivot", "GroupBuilder", "KeyCodec",
+    "chain", "aggregators",
 ]
 
@@ -0,0 +1,214 @@
+import typing
+import dataclasses
+import builtins
+import abc
+
+
+T = typing.TypeVar('T')
+V = typing.TypeVar('V')
+S = typing.TypeVar('S')
+
+
+class _EMPTY_TYPE:
+    '''Marks an aggregator state that has not seen any elements.'''
+    pass
+
+_EMPTY = _EMPTY_TYPE()
+
+
+class Aggregator(abc.ABC, typing.Generic[T, S, V]):
+    '''Base class for incremental aggregators that can be computed in a single pass over a collection.'''
+
+    @abc.abstractmethod
+    def start(self) -> S:
+        '''Return the initial state.'''
+        pass
+
+    @abc.abstractmethod
+    def update(self, state: S, element: T) -> S:
+        '''Return the state after seeing an element.'''
+        pass
+
+    def finish(self, state: S) -> V:
+        '''Return the aggregated value from a final state.'''
+        return state
+
+    def merge(self, state: S, other: S) -> S:
+        '''Return the state for the combined elements of two states without modifying either. 
+            Only mergeable aggregators implement this.
+        '''
+        raise TypeError(f'{self.__class__.__name__} aggregator cannot be merged.')
+
+    def collect(self, collection: typing.Iterable[T]) -> S:
+        '''Return the state after seeing all elements of a collection. Subclasses override this when the 
+            state of a whole collection can be computed faster than by calling update on each element.
+        '''
+        state = self.start()
+        for e in collection:
+            state = self.update(state, e)
+        return state
+
+    def __call__(self, collection: typing.Iterable[T]) -> V:
+        '''Aggregate a collection in one pass so aggregators can be used anywhere a function is accepted.'''
+        return self.finish(self.collect(collection))
+
+    def _values(self, collection: typing.Iterable[T]) -> typing.Iterable[typing.Any]:
+        return collection if getattr(self, 'func', None) is None else builtins.map(self.func, collection)
+
+
+def _collects_per_element(aggregator: Aggregator) -> bool:
+    '''True if the aggregator computes whole collections with per-element update calls, so it is cheaper 
+        to share one pass over the elements with other such aggregators than to call it separately.
+    '''
+    return type(aggregator).collect is Aggregator.collect
+
+
+@dataclasses.dataclass
+class count(Aggregator[T, int, int]):
+    '''Count the elements.'''
+    def start(self) -> int:
+        return 0
+
+    def update(self, state: int, element: T) -> int:
+        return state + 1
+
+    def collect(self, collection: typing.Iterable[T]) -> int:
+        if isinstance(collection, typing.Sized):
+            return len(collection)
+        return builtins.sum(1 for _ in collection)
+
+    def merge(self, state: int, other: int) -> int:
+        return state + other
+
+
+@dataclasses.dataclass
+class sum(Aggregator[T, typing.Any, typing.Any]):
+    '''Sum the elements, or the values of func applied to the elements.'''
+    func: typing.Callable[[T], typing.Any]|None = None
+
+    def start(self) -> typing.Any:
+        return 0
+
+    def update(self, state: typing.Any, element: T) -> typing.Any:
+        return state + (element if self.func is None else self.func(element))
+
+    def collect(self, collection: typing.Iterable[T]) -> typing.Any:
+        return builtins.sum(self._values(collection))
+
+    def merge(self, state: typing.Any, other: typing.Any) -> typing.Any:
+        return state + other
+
+
+@dataclasses.dataclass
+class mean(Aggregator[T, tuple[int, typing.Any], float]):
+    '''Average the elements, or the values of func applied to the elements.'''
+    func: typing.Callable[[T], typing.Any]|None = None
+
+    def start(self) -> tuple[int, typing.Any]:
+        return (0, 0)
+
+    def update(self, state: tuple[int, typing.Any], element: T) -> tuple[int, typing.Any]:
+        return (state[0] + 1, state[1] + (element if self.func is None else self.func(element)))
+
+    def collect(self, collection: typing.Iterable[T]) -> tuple[int, typing.Any]:
+        if not isinstance(collection, typing.Sized):
+            collection = list(collection)
+        return (len(collection), builtins.sum(self._values(collection)))
+
+    def merge(self, state: tuple[int, typing.Any], other: tuple[int, typing.Any]) -> tuple[int, typing.Any]:
+        return (state[0] + other[0], state[1] + other[1])
+
+    def finish(self, state: tuple[int, typing.Any]) -> float:
+        if state[0] == 0:
+            raise ValueError('mean of an empty collection.')
+        return state[1] / state[0]
+
+
+@dataclasses.dataclass
+class min(Aggregator[T, typing.Any, typing.Any]):
+    '''Minimum of the elements, or of the values of func applied to the elements.'''
+    func: typing.Callable[[T], typing.Any]|None = None
+
+    def start(self) -> typing.Any:
+        return _EMPTY
+
+    def update(self, state: typing.Any, element: T) -> typing.Any:
+        value = element if self.func is None else self.func(element)
+        return value if state is _EMPTY or value < state else state
+
+    def collect(self, collection: typing.Iterable[T]) -> typing.Any:
+        return builtins.min(self._values(collection), default=_EMPTY)
+
+    def merge(self, state: typing.Any, other: typing.Any) -> typing.Any:
+        if state is _EMPTY or (other is not _EMPTY and other < state):
+            return other
+        return state
+
+    def finish(self, state: typing.Any) -> typing.Any:
+        if state is _EMPTY:
+            raise ValueError('min of an empty collection.')
+        return state
+
+
+@dataclasses.dataclass
+class max(Aggregator[T, typing.Any, typing.Any]):
+    '''Maximum of the elements, or of the values of func applied to the elements.'''
+    func: typing.Callable[[T], typing.Any]|None = None
+
+    def start(self) -> typing.Any:
+        return _EMPTY
+
+    def update(self, state: typing.Any, element: T) -> typing.Any:
+        value = element if self.func is None else self.func(element)
+        return value if state is _EMPTY or value > state else state
+
+    def collect(self, collection: typing.Iterable[T]) -> typing.Any:
+        return builtins.max(self._values(collection), default=_EMPTY)
+
+    def merge(self, state: typing.Any, other: typing.Any) -> typing.Any:
+        if state is _EMPTY or (other is not _EMPTY and other > state):
+            return other
+        return state
+
+    def finish(self, state: typing.Any) -> typing.Any:
+        if state is _EMPTY:
+            raise ValueError('max of an empty collection.')
+        return state
+
+
+@dataclasses.dataclass
+class distinct(Aggregator[T, set, int]):
+    '''Count the distinct elements, or the distinct values of func applied to the elements.'''
+    func: typing.Callable[[T], typing.Any]|None = None
+
+    def start(self) -> set:
+        return set()
+
+    def update(self, state: set, element: T) -> set:
+        state.add(element if self.func is None else self.func(element))
+        return state
+
+    def collect(self, collection: typing.Iterable[T]) -> set:
+        return set(self._values(collection))
+
+    def merge(self, state: set, other: set) -> set:
+        return state | other
+
+    def finish(self, state: set) -> int:
+        return len(state)
+
+
+_BUILTIN_AGGREGATORS = {
+    len: count,
+    builtins.sum: sum,
+    builtins.min: min,
+    builtins.max: max,
+}
+
+def as_aggregator(func: typing.Callable[[typing.Iterable[T]], V]|Aggregator[T, typing.Any, V]) -> Aggregator[T, typing.Any, V]|typing.Callable[[typing.Iterable[T]], V]:
+    '''Return the incremental equivalent of len, sum, min and max, or func unchanged otherwise.'''
+    try:
+        return _BUILTIN_AGGREGATORS[func]()
+    except (KeyError, TypeError):
+        return func
+
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import typing
+import threading
+from collections.abc import Callable, Iterable, Hashable
+
+from .groups import Groups, NestedGroups
+from .typed_collections import tlist
+
+
+T = typing.TypeVar('T')
+K = typing.TypeVar('K', bound=Hashable)
+
+
+class GroupBuilder(typing.Generic[T, K]):
+    '''Builds groups from items added concurrently by multiple threads.
+
+    Each thread adds items to its own shard dictionary, so add and add_many never wait on a lock and
+    scale across threads, including on free-threaded (no-GIL) builds of CPython. The shards are merged
+    when build is called, which should happen after all producer threads have finished adding items.
+    Items from the same thread keep their order within each group.
+
+    Example:
+        >>> builder = GroupBuilder(lambda r: r['user'])
+        >>> # in each producer thread: builder.add_many(records)
+        >>> groups = builder.build()
+    '''
+    def __init__(self, key_func: Callable[[T], K|tuple[K, ...]], multi: bool = False):
+        '''
+        Args:
+            key_func: A function that returns the key of an item, or a tuple of keys if multi is True.
+            multi: If True, build NestedGroups with one level per key in the tuple, otherwise Groups.
+        '''
+        self.key_func = key_func
+        self.multi = multi
+        self._local = threading.local()
+        self._shards: list[dict[K, list[T]]] = []
+        self._lock = threading.Lock()
+
+    def add(self, item: T) -> None:
+        '''Add one item from the calling thread.'''
+        shard = self._shard()
+        key = self.key_func(item)
+        if key not in shard:
+            shard[key] = []
+        shard[key].append(item)
+
+    def add_many(self, items: Iterable[T]) -> None:
+        '''Add several items from the calling thread.'''
+        shard = self._shard()
+        key_func = self.key_func
+        for item in items:
+            key = key_func(item)
+            if key not in shard:
+                shard[key] = []
+            shard[key].append(item)
+
+    def build(self) -> Groups[T]|NestedGroups[T]:
+        '''Merge the items added by all threads into groups of tlists.'''
+        with self._lock:
+            shards = list(self._shards)
+        merged: dict[K, tlist[T]] = {}
+        for shard in shards:
+            for key, items in shard.items():
+                if key in merged:
+                    merged[key].extend(items)
+                else:
+                    merged[key] = tlist(items)
+        if self.multi:
+            return NestedGroups.from_leaves(merged.items())
+        return Groups(merged)
+
+    def _shard(self) -> dict[K, list[T]]:
+        '''Return the shard of the calling thread, registering a new one on its first call.'''
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
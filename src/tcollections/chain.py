@@ -3,8 +3,9 @@ import typing
 import dataclasses
 import collections
 
-from .typed_collections import TypedCollection
-from .groups import Groups, NestedGroups, GroupCollection
+from .typed_collections import TypedCollection, tlist, DEFAULT_VALUE
+from .groups import Groups, NestedGroups, GroupCollection, GroupsBase
+from .external_sort import iter_sorted_external, DEFAULT_RUN_SIZE
 
 
 
@@ -16,6 +17,26 @@ K = typing.TypeVar('K', bound=typing.Hashable)  # Keys must be hashable
 class ChainFunc:
     pass
 
+class source(TypedCollection[T]):
+    '''A lazily evaluated, single-pass collection over an iterable. Use it as the start of a chain to stream 
+        records (e.g. source.from_ndjson(path)) into grouping and aggregation without materializing them first.
+    '''
+    def __init__(self, iterable: typing.Iterable[T]):
+        self._iterable = iterable
+
+    def __iter__(self) -> typing.Iterator[T]:
+        return iter(self._iterable)
+
+    def to_list(self) -> tlist[T]:
+        '''Consume the source into a tlist.'''
+        return tlist(self)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._iterable!r})'
+
+class _batch_source(source[TypedCollection[T]]):
+    '''A source whose elements are batches, as produced by chain.batch.'''
+
 @dataclasses.dataclass
 class map(ChainFunc):
     '''Chain operator that maps a function over a typed collection.'''
@@ -38,6 +59,83 @@ class sort(ChainFunc):
     def __call__(self, collection: TypedCollection[T]) -> TypedCollection[T]:
         return collection.sort(reverse=self.reverse)
 
+@dataclasses.dataclass
+class take(ChainFunc):
+    '''Chain operator that keeps the first n elements of a typed collection.'''
+    n: int
+    def __call__(self, collection: TypedCollection[T]) -> TypedCollection[T]:
+        return collection.take(self.n)
+
+@dataclasses.dataclass
+class head(ChainFunc):
+    '''Chain operator that keeps the first n elements of each group, or of a typed collection.'''
+    n: int
+    def __call__(self, collection: NestedGroups[K, GroupCollection[T]]|Groups[K, GroupCollection[T]]|TypedCollection[T]) -> NestedGroups[K, GroupCollection[T]]|Groups[K, GroupCollection[T]]|TypedCollection[T]:
+        if isinstance(collection, GroupsBase):
+            return collection.head(self.n)
+        return collection.take(self.n)
+
+@dataclasses.dataclass
+class first(ChainFunc):
+    '''Chain operator that gets the first element of a typed collection.'''
+    default: typing.Any = DEFAULT_VALUE
+    def __call__(self, collection: TypedCollection[T]) -> T:
+        return collection.first(self.default)
+
+@dataclasses.dataclass
+class find(ChainFunc):
+    '''Chain operator that gets the first element of a typed collection that satisfies a function.'''
+    func: typing.Callable[[T], bool]
+    default: typing.Any = None
+    def __call__(self, collection: TypedCollection[T]) -> T:
+        return collection.find(self.func, self.default)
+
+@dataclasses.dataclass
+class any(ChainFunc):
+    '''Chain operator that checks whether any element of a typed collection satisfies a function (or is truthy).'''
+    func: typing.Callable[[T], bool]|None = None
+    def __call__(self, collection: TypedCollection[T]) -> bool:
+        return collection.any(self.func)
+
+@dataclasses.dataclass
+class sort_external(ChainFunc):
+    '''Chain operator that lazily sorts a typed collection with an external merge sort, using temporary files 
+        for runs of run_size elements so the data does not need to fit in memory.
+    '''
+    key: typing.Callable[[T], typing.Any]|None = None
+    reverse: bool = False
+    run_size: int = DEFAULT_RUN_SIZE
+    tmpdir: str|None = None
+    def __call__(self, collection: typing.Iterable[T]) -> source[T]:
+        return source(iter_sorted_external(collection, key=self.key, reverse=self.reverse, run_size=self.run_size, tmpdir=self.tmpdir))
+
+@dataclasses.dataclass
+class batch(ChainFunc):
+    '''Chain operator that lazily splits a typed collection into chunks of at most n elements 
+        (views that do not copy the elements when the collection is a sequence).
+    '''
+    n: int
+    def __call__(self, collection: TypedCollection[T]) -> source[TypedCollection[T]]:
+        return _batch_source(collection.iter_chunks(self.n))
+
+@dataclasses.dataclass
+class for_each_batch(ChainFunc):
+    '''Chain operator that passes each batch to a function (e.g. a bulk database insert) and returns the 
+        number of batches. The collection is split into chunks of at most n elements. n may only be omitted 
+        when the collection is already split into batches by chain.batch.
+    '''
+    func: typing.Callable[[TypedCollection[T]], typing.Any]
+    n: int|None = None
+    def __call__(self, collection: TypedCollection[T]) -> int:
+        if self.n is None and not isinstance(collection, _batch_source):
+            raise ValueError('for_each_batch requires n unless the collection comes from chain.batch.')
+        batches = collection if self.n is None else collection.iter_chunks(self.n)
+        count = 0
+        for b in batches:
+            self.func(b)
+            count += 1
+        return count
+
 @dataclasses.dataclass
 class value_counts(ChainFunc):
     '''Chain operator that counts the elements in a typed collection.'''
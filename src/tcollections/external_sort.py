@@ -0,0 +1,75 @@
+import typing
+import contextlib
+import heapq
+import itertools
+import pickle
+import tempfile
+import os
+
+
+T = typing.TypeVar('T')
+
+DEFAULT_RUN_SIZE = 1_000_000 # elements per sorted run
+_BLOCK_SIZE = 1024 # records per pickled block in a run file
+
+
+def iter_sorted_external(
+    iterable: typing.Iterable[T],
+    key: typing.Callable[[T], typing.Any]|None = None,
+    reverse: bool = False,
+    run_size: int = DEFAULT_RUN_SIZE,
+    tmpdir: str|os.PathLike|None = None,
+) -> typing.Iterator[T]:
+    '''Sort elements that may not fit in memory with an external merge sort.
+
+    Args:
+        iterable: The elements to sort. Consumed run_size elements at a time.
+        key: A function of one element used for comparisons. Called once per element.
+        reverse: Sort in descending order.
+        run_size: The number of elements sorted in memory at once. Each sorted run is written to a
+            temporary file as pickled blocks unless all elements fit in a single run.
+        tmpdir: Directory for the temporary run files (the system default if None).
+
+    Returns:
+        An iterator of the sorted elements. The sort is stable and the temporary files are deleted
+        when the iterator is exhausted or closed.
+    '''
+    if run_size < 1:
+        raise ValueError(f'run_size must be positive, not {run_size}.')
+    it = iter(iterable)
+    sign = -1 if reverse else 1
+    seq = itertools.count()
+    with contextlib.ExitStack() as stack:
+        runs = []
+        while True:
+            # decorate with a sequence number so ties are stable and elements are never compared
+            run = [(e if key is None else key(e), sign * next(seq), e) for e in itertools.islice(it, run_size)]
+            if not run:
+                break
+            run.sort(reverse=reverse)
+            if not runs and len(run) < run_size:
+                yield from (r[2] for r in run)
+                return
+            runs.append(_write_run(run, stack.enter_context(tempfile.TemporaryFile(dir=tmpdir))))
+            del run
+        for r in heapq.merge(*runs, reverse=reverse):
+            yield r[2]
+
+
+def _write_run(run: list[tuple], f: typing.BinaryIO) -> typing.Iterator[tuple]:
+    '''Write a sorted run to a file and return an iterator that reads it back.'''
+    for i in range(0, len(run), _BLOCK_SIZE):
+        pickle.dump(run[i:i + _BLOCK_SIZE], f, protocol=pickle.HIGHEST_PROTOCOL)
+    f.seek(0)
+    return _read_run(f)
+
+
+def _read_run(f: typing.BinaryIO) -> typing.Iterator[tuple]:
+    '''Read the records of a run file one block at a time.'''
+    while True:
+        try:
+            block = pickle.load(f)
+        except EOFError:
+            return
+        yield from block
+
@@ -10,33 +10,59 @@ K = TypeVar('K', bound=Hashable)  # Keys must be hashable
 V = TypeVar('V')
 U = TypeVar('U')
 
-from .group_funcs_lowlevel import _groupby, _groupby_multi
-from .groups import Groups, NestedGroups
-from .typed_collections import tlist, tset
+from .group_funcs_lowlevel import DEFAULT_BATCH_SIZE
+from .groups import Groups, NestedGroups, EncodedGroups
+from .typed_collections import tlist, tset, Grouper
 
 
-def groupby_multi(iterable: Iterable[T], key_func: Callable[[T], tuple[K, ...]]) -> NestedGroups[T]:
+def groupby_multi(
+    iterable: Iterable[T], 
+    key_func: Callable[[T], tuple[K, ...]]|None = None, 
+    *, 
+    batch_key_func: Callable[[list[T]], typing.Sequence[tuple[K, ...]]]|None = None, 
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    encode_keys: bool = False,
+) -> NestedGroups[T]|EncodedGroups[T]:
     '''Group items from a collection by multiple keys using a single key function that returns a tuple of keys.'''
-    result = _groupby_multi(iterable, key_func)
-    return NestedGroups.from_dict(result, tlist)
+    return Grouper(iterable).multi(key_func, batch_key_func=batch_key_func, batch_size=batch_size, encode_keys=encode_keys)
 
-def groupby(iterable: Iterable[T], key_func: Callable[[T], K]) -> Groups[T, tlist[T]]:
+def groupby(
+    iterable: Iterable[T], 
+    key_func: Callable[[T], K]|None = None, 
+    *, 
+    batch_key_func: Callable[[list[T]], typing.Sequence[K]]|None = None, 
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_per_group: int|None = None,
+    sample: typing.Literal['reservoir', 'first', 'last'] = 'reservoir',
+    seed: int|None = None,
+) -> Groups[T, tlist[T]]:
     '''Group items from a collection by a single key using a key function.'''
-    result = _groupby(iterable, key_func)
-    #return Groups({k: tlist(v) for k, v in result.items()})
-    return Groups.from_dict(result, tlist)
+    return Grouper(iterable).by(key_func, batch_key_func=batch_key_func, batch_size=batch_size, max_per_group=max_per_group, sample=sample, seed=seed)
 
 class group:
     '''Contains static methods for grouping collections.'''
     @staticmethod
-    def multi(iterable: Iterable[T], key_func: Callable[[T], tuple[K, ...]]) -> NestedGroups[T]:
+    def multi(
+        iterable: Iterable[T], 
+        key_func: Callable[[T], tuple[K, ...]]|None = None, 
+        *, 
+        batch_key_func: Callable[[list[T]], typing.Sequence[tuple[K, ...]]]|None = None, 
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        encode_keys: bool = False,
+    ) -> NestedGroups[T]|EncodedGroups[T]:
         '''Group items from a collection by multiple keys using a single key function that returns a tuple of keys.'''
-        result = _groupby_multi(iterable, key_func)
-        return NestedGroups.from_dict(result, tlist)
+        return Grouper(iterable).multi(key_func, batch_key_func=batch_key_func, batch_size=batch_size, encode_keys=encode_keys)
 
     @staticmethod
-    def by(iterable: Iterable[T], key_func: Callable[[T], K]) -> Groups[T, tlist[T]]:
+    def by(
+        iterable: Iterable[T], 
+        key_func: Callable[[T], K]|None = None, 
+        *, 
+        batch_key_func: Callable[[list[T]], typing.Sequence[K]]|None = None, 
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_per_group: int|None = None,
+        sample: typing.Literal['reservoir', 'first', 'last'] = 'reservoir',
+        seed: int|None = None,
+    ) -> Groups[T, tlist[T]]:
         '''Group items from a collection by a single key using a key function.'''
-        result = _groupby(iterable, key_func)
-        #return Groups({k: tlist(v) for k, v in result.items()})
-        return Groups.from_dict(result, tlist)
+        return Grouper(iterable).by(key_func, batch_key_func=batch_key_func, batch_size=batch_size, max_per_group=max_per_group, sample=sample, seed=seed)
@@ -3,6 +3,9 @@ from typing import TypeVar, Protocol, Iterator, Union, runtime_checkable, Self,
 from collections.abc import Callable, Iterable, Hashable
 from abc import ABC, abstractmethod
 import typing  # Keep this for backward compatibility
+import itertools
+import collections
+import random
 
 
 T = TypeVar('T')
@@ -10,6 +13,9 @@ K = TypeVar('K', bound=Hashable)  # Keys must be hashable
 V = TypeVar('V')
 U = TypeVar('U')
 
+DEFAULT_BATCH_SIZE = 4096
+SAMPLE_METHODS = ('first', 'last', 'reservoir')
+
 
 def _groupby(iterable: Iterable[T], key_func: Callable[[T], K]) -> dict[K, list[T]]:
     '''Group items from a collection by a single key function.
@@ -78,6 +84,217 @@ def _groupby_multi(iterable: Iterable[T], key_func: Callable[[T], tuple[K, ...]]
 
 
 
+def _groupby_batched(iterable: Iterable[T], batch_key_func: Callable[[list[T]], typing.Sequence[K]], batch_size: int = DEFAULT_BATCH_SIZE) -> dict[K, list[T]]:
+    '''Group items from a collection by a key function that computes the keys for a whole batch of elements at once.
+    
+    Args:
+        iterable: The collection to group.
+        batch_key_func: A function that receives a list of up to batch_size elements and returns a sequence 
+            (or NumPy array) with one key per element.
+        batch_size: The maximum number of elements passed to batch_key_func at once.
+    
+    Returns:
+        A dictionary where keys are the result of the key function and values are lists of elements that share the same key.
+    
+    Example:
+        >>> items = ['apple', 'banana', 'cherry', 'date']
+        >>> result = _groupby_batched(items, lambda batch: [x[0] for x in batch])
+        >>> # Result will be: {'a': ['apple'], 'b': ['banana'], 'c': ['cherry'], 'd': ['date']}
+    '''
+    result = {}
+    
+    for keys, batch in _iter_key_batches(iterable, batch_key_func, batch_size):
+        for key, element in zip(keys, batch):
+            if key not in result:
+                result[key] = []
+            result[key].append(element)
+    
+    return result
+
+
+def _groupby_multi_batched(iterable: Iterable[T], batch_key_func: Callable[[list[T]], typing.Sequence[tuple[K, ...]]], batch_size: int = DEFAULT_BATCH_SIZE) -> dict[K,list[T]|dict[K,list[T]]]:
+    '''Group items from a collection by multiple keys using a key function that returns a tuple of keys for each 
+    element of a whole batch at once. See _groupby_multi and _groupby_batched.
+    '''
+    result = RecursiveDefaultDict()
+    
+    for keys_batch, batch in _iter_key_batches(iterable, batch_key_func, batch_size):
+        for keys, element in zip(keys_batch, batch):
+            current = result
+            for key in keys[:-1]:
+                current = current[key]
+            
+            last_key = keys[-1]
+            if last_key not in current:
+                current[last_key] = []
+            current[last_key].append(element)
+    
+    return result.to_dict()
+
+
+def _groupby_encoded(keyed: Iterable[tuple[tuple[K, ...], T]], encode: Callable[[tuple[K, ...]], tuple[int, ...]]) -> dict[tuple[int, ...], list[T]]:
+    '''Group (key tuple, element) pairs into a flat dictionary keyed by the encoded key tuples.
+    
+    Args:
+        keyed: Pairs of a tuple of keys and the element they belong to.
+        encode: A function that maps a key tuple to a tuple of integer codes, such as KeyCodec.encode.
+    
+    Returns:
+        A dictionary where keys are code tuples and values are lists of elements that share the same keys.
+    
+    Example:
+        >>> codec = KeyCodec()
+        >>> result = _groupby_encoded([(('a', 1), 'x'), (('b', 1), 'y'), (('a', 1), 'z')], codec.encode)
+        >>> # Result will be: {(0, 0): ['x', 'z'], (1, 0): ['y']}
+    '''
+    result = {}
+    cache = {} # avoids re-encoding key tuples already seen
+    
+    for keys, element in keyed:
+        if type(keys) is not tuple:
+            keys = tuple(keys) # e.g. rows of a 2-D NumPy key array, which tolist() returns as lists
+        codes = cache.get(keys)
+        if codes is None:
+            codes = cache[keys] = encode(keys)
+            result[codes] = []
+        result[codes].append(element)
+    
+    return result
+
+
+def _groupby_sampled(keyed: Iterable[tuple[K, T]], max_per_group: int, sample: str = 'reservoir', seed: int|None = None) -> tuple[dict[K, list[T]], dict[K, int]]:
+    '''Group (key, element) pairs, keeping at most max_per_group elements per key while streaming.
+    
+    Args:
+        keyed: Pairs of (key, element), e.g. ((key_func(e), e) for e in iterable).
+        max_per_group: The maximum number of elements kept per key.
+        sample: Which elements to keep: 'first', 'last' or 'reservoir' (a uniform random sample, 
+            in which elements are not necessarily in their original order).
+        seed: Seed for the random number generator used by reservoir sampling.
+    
+    Returns:
+        A tuple of a dictionary mapping keys to lists of kept elements, and a dictionary mapping keys 
+        to the total number of elements seen with that key.
+    
+    Example:
+        >>> result, totals = _groupby_sampled(((x % 2, x) for x in range(10)), 2, 'first')
+        >>> # result will be: {0: [0, 2], 1: [1, 3]}, totals will be: {0: 5, 1: 5}
+    '''
+    if max_per_group < 1:
+        raise ValueError(f'max_per_group must be positive, not {max_per_group}.')
+    _check_sample(sample)
+    totals = {}
+    if sample == 'first':
+        result = {}
+        for key, element in keyed:
+            if key not in result:
+                result[key] = []
+                totals[key] = 0
+            totals[key] += 1
+            if len(result[key]) < max_per_group:
+                result[key].append(element)
+    elif sample == 'last':
+        result = {}
+        for key, element in keyed:
+            if key not in result:
+                result[key] = collections.deque(maxlen=max_per_group)
+                totals[key] = 0
+            totals[key] += 1
+            result[key].append(element)
+        result = {k: list(v) for k, v in result.items()}
+    else:
+        rng = random.Random(seed)
+        result = {}
+        for key, element in keyed:
+            if key not in result:
+                result[key] = []
+                totals[key] = 0
+            totals[key] += 1
+            reservoir = result[key]
+            if len(reservoir) < max_per_group:
+                reservoir.append(element)
+            else:
+                j = rng.randrange(totals[key])
+                if j < max_per_group:
+                    reservoir[j] = element
+    return result, totals
+
+
+def _check_sample(sample: str) -> None:
+    if sample not in SAMPLE_METHODS:
+        raise ValueError(f'sample must be "first", "last" or "reservoir", not {sample!r}.')
+
+
+def _iter_key_batches(iterable: Iterable[T], batch_key_func: Callable[[list[T]], typing.Sequence[K]], batch_size: int) -> Iterator[tuple[typing.Sequence[K], list[T]]]:
+    '''Split an iterable into lists of at most batch_size elements and yield each with its keys.'''
+    if batch_size < 1:
+        raise ValueError(f'batch_size must be positive, not {batch_size}.')
+    it = iter(iterable)
+    while batch := list(itertools.islice(it, batch_size)):
+        keys = batch_key_func(batch)
+        if hasattr(keys, 'tolist'):
+            keys = keys.tolist() # NumPy arrays: iterate over Python objects instead of array scalars
+        if len(keys) != len(batch):
+            raise ValueError(f'batch_key_func returned {len(keys)} keys for a batch of {len(batch)} elements.')
+        yield keys, batch
+
+
+def _iter_tree(tree: dict, is_node: Callable[[Any], bool], max_depth: int|None = None) -> Iterator[tuple[tuple, Any]]:
+    '''Walk a tree of nested dictionaries depth-first using an explicit stack instead of recursion.
+    
+    Args:
+        tree: The root dictionary of the tree.
+        is_node: A function that returns True if a value is an inner node that should be descended into.
+        max_depth: If provided, nodes at this depth are yielded but not descended into.
+    
+    Returns:
+        An iterator of (key_path, value) pairs for every entry below the root in pre-order, where key_path is 
+        the tuple of keys leading to the value.
+    
+    Example:
+        >>> list(_iter_tree({'a': {'b': [1]}}, lambda v: isinstance(v, dict)))
+        >>> # Result will be: [(('a',), {'b': [1]}), (('a', 'b'), [1])]
+    '''
+    stack = [((), iter(tree.items()))]
+    while stack:
+        path, items = stack[-1]
+        for key, value in items:
+            key_path = path + (key,)
+            yield key_path, value
+            if is_node(value) and (max_depth is None or len(key_path) < max_depth):
+                stack.append((key_path, iter(value.items())))
+                break
+        else:
+            stack.pop()
+
+
+def _map_tree(tree: dict, is_node: Callable[[Any], bool], node_type: Callable[[], dict], leaf_func: Callable[[Any], V]) -> dict:
+    '''Copy a tree of nested dictionaries without recursion.
+    
+    Args:
+        tree: The root dictionary of the tree.
+        is_node: A function that returns True if a value is an inner node that should be copied as a node.
+        node_type: Called with no arguments to create each (empty) node of the new tree, including the root.
+        leaf_func: Applied to every leaf value.
+    
+    Returns:
+        The root of the new tree.
+    '''
+    root = node_type()
+    stack = [(iter(tree.items()), root)]
+    while stack:
+        items, out = stack[-1]
+        for key, value in items:
+            if is_node(value):
+                child = out[key] = node_type()
+                stack.append((iter(value.items()), child))
+                break
+            out[key] = leaf_func(value)
+        else:
+            stack.pop()
+    return root
+
+
 class RecursiveDefaultDict(dict[K, Union['RecursiveDefaultDict[K, V]', V]]):
     '''A dictionary that recursively creates nested dictionary structures. Used to create tree-like structures.
     
@@ -104,6 +321,6 @@ class RecursiveDefaultDict(dict[K, Union['RecursiveDefaultDict[K, V]', V]]):
 
     def to_type(self, dict_type: typing.Type[dict], value_type: typing.Type[V]) -> dict[K, Union[dict, V]]:
         '''Convert the RecursiveDefaultDict to a regular dictionary.'''
-        return dict_type({k: (dict_type(v.to_type(dict_type, value_type)) if isinstance(v, self.__class__) else value_type(v)) for k, v in self.items()})
+        return _map_tree(self, lambda v: isinstance(v, RecursiveDefaultDict), dict_type, value_type)
 
 
@@ -4,9 +4,19 @@ from collections.abc import Callable, Iterable, Hashable
 from abc import ABC, abstractmethod
 import typing  # Keep this for backward compatibility
 import json
+import itertools
+import functools
+import collections.abc
+
+from .group_funcs_lowlevel import _iter_tree, _map_tree, _groupby
+from .aggregators import Aggregator, as_aggregator, _collects_per_element
+from .pivot import Pivot
+from .keys import KeyCodec
+from .memory import MemoryUsage, groups_memory_usage, DEFAULT_SAMPLE_SIZE, DEFAULT_TOP
 
 if typing.TYPE_CHECKING:
     from .chain import ChainFunc
+    from .shared import SharedCollection
 
 T = TypeVar('T')
 K = TypeVar('K', bound=Hashable)  # Keys must be hashable
@@ -22,6 +32,32 @@ class GroupCollection(Protocol[T]):
     def agg(self, func: Callable[[T], V]) -> V: ...
 
 
+def _is_groups(value: Any) -> bool:
+    return isinstance(value, GroupsBase)
+
+
+def _frame_index(key_paths: list[tuple], lengths: 'numpy.ndarray|None', index_names: typing.Sequence[str]|None) -> 'pandas.Index':
+    """Build a pandas index with one entry per key path, each repeated lengths[i] times if lengths is given.
+        Each level is built from its distinct keys and integer codes, so pandas does not have to parse 
+        one Python object per row.
+    """
+    import pandas
+    import numpy
+    depth = len(key_paths[0]) if key_paths else 1
+    levels, codes = [], []
+    for level in range(depth):
+        positions = {}
+        level_codes = numpy.fromiter((positions.setdefault(key_path[level], len(positions)) for key_path in key_paths), dtype=numpy.intp, count=len(key_paths))
+        values = numpy.empty(len(positions), dtype=object)
+        values[:] = list(positions)
+        levels.append(pandas.Index(values).infer_objects())
+        codes.append(level_codes if lengths is None else numpy.repeat(level_codes, lengths))
+    names = list(index_names) if index_names else [None] * depth
+    if depth == 1:
+        return levels[0].take(codes[0]).rename(names[0])
+    return pandas.MultiIndex(levels=levels, codes=codes, names=names, verify_integrity=False)
+
+
 class GroupsBase(dict[K, Self|GroupCollection[T]]):
     """Abstract base class for grouped collections with shared implementation."""
     
@@ -29,25 +65,127 @@ class GroupsBase(dict[K, Self|GroupCollection[T]]):
         """Aggregate each group using the provided function."""
         return {k: v.agg(func) for k, v in self.items()}
     
+    def agg_many(self, funcs: dict[str, Callable[[GroupCollection[T]], Any]|Aggregator], key_name: str = 'key') -> dict[str, list]:
+        """Compute several named aggregations for each group, returned as columns (a dict of equal-length lists).
+            Functions such as len, sum, min and max, and aggregators with a whole-collection fast path (count, sum, 
+            mean, min, max, distinct), are applied to each whole group. Other aggregators are computed together 
+            in a single pass over each group's elements. Nested groups are keyed by tuples.
+        """
+        if key_name in funcs:
+            raise ValueError(f'Aggregation name "{key_name}" conflicts with the key column.')
+        _, keys, columns = self._agg_columns(funcs)
+        return {key_name: keys, **columns}
+    
+    def _agg_columns(self, funcs: dict[str, Callable[[GroupCollection[T]], Any]|Aggregator]) -> tuple[list[tuple], list[Hashable], dict[str, list]]:
+        """Compute the agg_many columns, returning the key paths, keys and aggregation columns."""
+        fused = [name for name, f in funcs.items() if isinstance(f, Aggregator) and _collects_per_element(f)]
+        separate = [(name, f) for name, f in funcs.items() if name not in fused]
+        aggs = [funcs[name] for name in fused]
+        updates = [a.update for a in aggs]
+        key_paths, keys, columns = [], [], {name: [] for name in funcs}
+        for key_path, group in self.iter_leaves():
+            key_paths.append(key_path)
+            keys.append(self._leaf_key(key_path))
+            for name, f in separate:
+                columns[name].append(f(group) if isinstance(f, Aggregator) else group.agg(f))
+            if aggs:
+                states = [a.start() for a in aggs]
+                for e in group:
+                    for i, update in enumerate(updates):
+                        states[i] = update(states[i], e)
+                for name, a, state in zip(fused, aggs, states):
+                    columns[name].append(a.finish(state))
+        return key_paths, keys, columns
+    
+    def to_frame(self, 
+        agg: Callable[[GroupCollection[T]], Any]|dict[str, Callable[[GroupCollection[T]], Any]|Aggregator]|None = None, 
+        name: str = 'value', 
+        index_names: typing.Sequence[str]|None = None,
+    ) -> 'pandas.DataFrame':
+        """Build a pandas DataFrame indexed by group keys (a MultiIndex for nested groups) directly from the groups.
+            Without agg, there is one row per element in a column called name. With an aggregation function, 
+            there is one row per group with the result in a column called name, and with a dictionary of 
+            named aggregations (see agg_many), one column per aggregation. Requires pandas.
+        """
+        try:
+            import pandas
+            import numpy
+        except ImportError as e:
+            raise ImportError('to_frame requires pandas to be installed.') from e
+        if agg is None:
+            key_paths, groups = [], []
+            for key_path, group in self.iter_leaves():
+                key_paths.append(key_path)
+                groups.append(group)
+            lengths = numpy.fromiter(map(len, groups), dtype=numpy.intp, count=len(groups))
+            columns = {name: list(itertools.chain.from_iterable(groups))}
+        else:
+            key_paths, _, columns = self._agg_columns(agg if isinstance(agg, dict) else {name: agg})
+            lengths = None
+        return pandas.DataFrame(columns, index=_frame_index(key_paths, lengths, index_names))
+    
+    def head(self, n: int) -> typing.Self:
+        """Keep only the first n elements of each group."""
+        return self._map_leaves(lambda group: group.__class__(itertools.islice(group, n)))
+    
+    _root_attributes: tuple[str, ...] = () # attributes of the root that describe the whole grouping
+
+    def _map_leaves(self, leaf_func: Callable[[GroupCollection[T]], Any]) -> typing.Self:
+        """Rebuild the groups with leaf_func applied to each leaf collection, keeping the root attributes."""
+        result = _map_tree(self, _is_groups, self.__class__, leaf_func)
+        for name in self._root_attributes:
+            if name in self.__dict__:
+                setattr(result, name, self.__dict__[name])
+        return result
+    
+    def _leaf_key(self, key_path: tuple) -> Hashable:
+        """Return the key of a leaf collection as used in agg_many results."""
+        return key_path[0]
+    
     def to_dict(self, collection_type: typing.Type[GroupCollection[T]]|None = None) -> dict[K, typing.Self|GroupCollection[T]]:
         """Convert the grouped collection to a standard dictionary."""
         collection_type = collection_type or self.get_collection_type()
-        return {k: dict(v.to_dict(collection_type)) if isinstance(v,self.__class__) else collection_type(v) for k, v in self.items()}
+        return _map_tree(self, _is_groups, dict, collection_type)
     
+    def iter_nodes(self, max_depth: int|None = None) -> Iterator[tuple[tuple, GroupsBase]]:
+        """Iterate over (key_path, groups) pairs for this grouping and every sub-grouping, depth-first. 
+            The key path of this grouping is the empty tuple.
+        """
+        yield (), self
+        for key_path, v in _iter_tree(self, _is_groups, max_depth):
+            if _is_groups(v):
+                yield key_path, v
+    
+    def iter_leaves(self, max_depth: int|None = None) -> Iterator[tuple[tuple, GroupCollection[T]|GroupsBase]]:
+        """Iterate over (key_path, group) pairs for every leaf collection, depth-first. 
+            If max_depth is provided, sub-groupings at that depth are yielded as leaves.
+        """
+        for key_path, v in _iter_tree(self, _is_groups, max_depth):
+            if not _is_groups(v) or len(key_path) == max_depth:
+                yield key_path, v
     
     def get_collection_type(self) -> typing.Type[GroupCollection[T]]:
         """Get the type of the collections stored in the groups."""
-        for v in self.values():
-            if isinstance(v, GroupsBase):
-                return v.get_collection_type()
-            else:
-                return type(v)
+        for _, v in self.iter_leaves():
+            return type(v)
         raise ValueError("No collections found in groups.")
     
     def __repr__(self) -> str:
         """String representation of the grouped collection."""
         return f'{self.__class__.__name__}({dict(self)})'
     
+    def memory_usage(self, deep: bool = False, top: int = DEFAULT_TOP, sample_size: int = DEFAULT_SAMPLE_SIZE) -> MemoryUsage:
+        """Report the bytes used by keys, containers and elements, per level and for the top heaviest groups. 
+            If deep, objects referenced by keys and elements are included (shared objects and cycles are counted once). 
+            Element sizes are extrapolated from a sample of sample_size elements for larger groups.
+        """
+        return groups_memory_usage(self, deep=deep, top=top, sample_size=sample_size)
+    
+    def to_shared(self) -> SharedCollection[T]:
+        """Copy the groups into shared memory, returning a handle that worker processes can attach to without copying."""
+        from .shared import SharedCollection
+        return SharedCollection.create(self)
+    
     def __rshift__(self, chain_func: ChainFunc) -> typing.Self:
         '''Pipe the collection into a function or another collection.'''
         return chain_func(self)
@@ -69,6 +207,8 @@ class GroupsBase(dict[K, Self|GroupCollection[T]]):
 
 class Groups(GroupsBase[T]):
     '''Concrete class for grouped collections with shared implementation.'''
+    totals: dict[K, int]|None = None # number of elements seen per group when groups were capped during grouping
+    _root_attributes = ('totals',)
     @classmethod
     def from_dict(cls, d: dict[K, Iterable[T]], collection_type: typing.Type[GroupCollection[T]]) -> Groups[T]:
         """Create a Groups instance from a standard dictionary."""
@@ -79,31 +219,248 @@ class Groups(GroupsBase[T]):
         collection_type = collection_type or self.get_collection_type()
         return collection_type(item for group in self.values() for item in group)
 
+class EncodedGroups(Groups[T]):
+    '''Flat groups of a multi-level grouping keyed by tuples of small integer codes instead of the original keys.
+        The codec maps the codes at each level back to the original keys, which are decoded only when requested.
+    '''
+    codec: KeyCodec|None = None
+    _root_attributes = ('totals', 'codec')
+
+    @classmethod
+    def from_encoded(cls, d: dict[tuple[int, ...], Iterable[T]], collection_type: typing.Type[GroupCollection[T]], codec: KeyCodec) -> EncodedGroups[T]:
+        """Create encoded groups from a dictionary keyed by code tuples and the codec that produced them."""
+        groups = cls.from_dict(d, collection_type)
+        groups.codec = codec
+        return groups
+
+    def decode_key(self, codes: tuple[int, ...]) -> tuple:
+        """Return the original key tuple of a code tuple."""
+        return self.codec.decode(codes)
+
+    def get_group(self, keys: tuple) -> GroupCollection[T]:
+        """Return the group of an original key tuple. Raises KeyError if there is no such group."""
+        return self[self.codec.lookup(keys)]
+
+    def iter_decoded(self) -> Iterator[tuple[tuple, GroupCollection[T]]]:
+        """Iterate over (key tuple, group) pairs with the original keys."""
+        decode = self.codec.decode
+        for codes, group in self.items():
+            yield decode(codes), group
+
+    def decode(self) -> NestedGroups[T]:
+        """Convert to nested groups with the original keys. Groups are stored by reference."""
+        return NestedGroups.from_leaves(self.iter_decoded())
+
 class NestedGroups(GroupsBase[T]):
     '''Concrete class for nested grouped collections with shared implementation.'''
 
     @classmethod
     def from_dict(cls, d: dict[K, Iterable[T]], collection_type: typing.Type[GroupCollection[T]]) -> Groups[T]:
         """Create a Groups instance from a standard dictionary."""
-        for k, v in d.items():
-            if isinstance(v, dict):
-                d[k] = cls.from_dict(v, collection_type)
+        return _map_tree(d, lambda v: isinstance(v, dict), cls, collection_type)
+    
+    @classmethod
+    def from_leaves(cls, leaves: Iterable[tuple[tuple, GroupCollection[T]]]) -> NestedGroups[T]:
+        """Create nested groups from (key_path, group) pairs such as those yielded by iter_leaves. 
+            Groups are stored by reference, except that groups with the same key path are combined into a new collection.
+        """
+        root = cls()
+        collisions: dict[tuple, tuple[NestedGroups[T], list[GroupCollection[T]]]] = {}
+        for key_path, group in leaves:
+            node = root
+            for key in key_path[:-1]:
+                if key not in node:
+                    node[key] = cls()
+                node = node[key]
+            last_key = key_path[-1]
+            if last_key in node:
+                # collect the groups for each path so each combined collection is built only once
+                if key_path not in collisions:
+                    collisions[key_path] = (node, [node[last_key]])
+                collisions[key_path][1].append(group)
             else:
-                d[k] = collection_type(v)
-        return cls(d)
+                node[last_key] = group
+        for key_path, (node, groups) in collisions.items():
+            node[key_path[-1]] = groups[0].__class__(itertools.chain.from_iterable(groups))
+        return root
+    
+    def reorder_levels(self, order: typing.Sequence[int]) -> NestedGroups[T]:
+        """Rearrange the levels of the grouping so that new level i is old level order[i]. 
+            Works on the existing key paths and moves groups by reference, so no keys are recomputed.
+        """
+        depth = self.depth()
+        order = [range(depth)[i] for i in order]
+        if sorted(order) != list(range(depth)):
+            raise ValueError(f'order must be a permutation of the {depth} levels, not {order!r}.')
+        return self.from_leaves((tuple(key_path[i] for i in order), group) for key_path, group in self.iter_leaves())
+    
+    def swap_levels(self, i: int, j: int) -> NestedGroups[T]:
+        """Swap two levels of the grouping without recomputing keys."""
+        order = list(range(self.depth()))
+        order[i], order[j] = order[j], order[i]
+        return self.reorder_levels(order)
+    
+    def drop_level(self, i: int) -> NestedGroups[T]:
+        """Remove a level of the grouping, combining the groups that then share a key path."""
+        depth = self.depth()
+        if depth < 2:
+            raise ValueError('Cannot drop the only level of a grouping.')
+        i = range(depth)[i]
+        return self.from_leaves((key_path[:i] + key_path[i+1:], group) for key_path, group in self.iter_leaves())
+    
+    def depth(self) -> int:
+        """Return the number of levels of the grouping, which must be the same for all groups."""
+        depths = {len(key_path) for key_path, _ in self.iter_leaves()}
+        if len(depths) > 1:
+            raise ValueError(f'Groups have different depths: {sorted(depths)}.')
+        return depths.pop() if depths else 0
     
     def ungroup(self, collection_type: typing.Type[GroupCollection[T]] = None) -> GroupCollection[T]:
         """Alias for flatten to combine all elements into a single collection."""
         collection_type = collection_type or self.get_collection_type()
-        return collection_type(e for grps in self.flatten().values() for e in grps)
+        return collection_type(e for _, grps in self.iter_leaves() for e in grps)
+
+    def rollup(self, aggregator: Aggregator[T, Any, V]|Callable[[GroupCollection[T]], V], grand_total: bool = False) -> dict[tuple, V]:
+        '''Compute subtotals for every level of the nested groups with a mergeable aggregator.
+            Each leaf collection is aggregated once and the states are merged upwards, so there is only one pass
+            over the elements. Returns a dictionary mapping each key path (parents before children) to its 
+            subtotal, starting with the grand total under the empty key path if grand_total is True.
+        '''
+        aggregator = as_aggregator(aggregator)
+        if not isinstance(aggregator, Aggregator):
+            raise TypeError(f'rollup requires an Aggregator, not {aggregator!r}.')
+        paths = [key_path for key_path, _ in _iter_tree(self, _is_groups)]
+        states = {key_path: aggregator.collect(group) for key_path, group in self.iter_leaves()}
+        for key_path, node in reversed(list(self.iter_nodes())):
+            child_states = [states[key_path + (k,)] for k in node.keys()]
+            states[key_path] = functools.reduce(aggregator.merge, child_states) if child_states else aggregator.start()
+        if grand_total:
+            paths.insert(0, ())
+        return {key_path: aggregator.finish(states[key_path]) for key_path in paths}
+
+    def pivot(self, func: Callable[[GroupCollection[T]], V], fill: V = 0, typecode: str = 'd') -> Pivot:
+        '''Aggregate a two-level grouping into a dense table with first-level keys as rows and second-level keys 
+            as columns. Values are stored in an array.array of the given typecode and missing cells are set to fill.
+        '''
+        def cells() -> Iterator[tuple[Hashable, Hashable, V]]:
+            for key_path, group in self.iter_leaves():
+                if len(key_path) != 2:
+                    raise ValueError(f'pivot requires exactly two levels of grouping, found key path {key_path!r}.')
+                yield key_path[0], key_path[1], group.agg(func)
+        return Pivot.from_cells(cells(), fill=fill, typecode=typecode)
+
+    def _leaf_key(self, key_path: tuple) -> tuple:
+        """Return the key of a leaf collection as used in agg_many results."""
+        return key_path
 
     def flatten(self) -> Groups[tuple, GroupCollection[T]]:
         '''Flatten the nested groups into a single grouping where keys are tuples of the original keys.'''
-        flattened = Groups[tuple, GroupCollection[T]]()
-        for key, group in self.items():
-            if isinstance(group, NestedGroups):
-                for sub_key, sub_value in group.flatten().items():
-                    flattened[(key,) + sub_key] = sub_value
-            else:
-                flattened[(key,)] = group
-        return flattened
+        return Groups[tuple, GroupCollection[T]](self.iter_leaves())
+
+
+class LazyNestedGroups(NestedGroups[T]):
+    '''Nested groups in which each sub-level is grouped the first time it is accessed, and then cached.
+        Keys at each level are available without grouping the level below them.
+    '''
+    def __init__(self, data: dict[K, Any] = (), key_funcs: typing.Sequence[Callable[[T], K]] = ()):
+        super().__init__(data)
+        self._key_funcs = tuple(key_funcs)
+        self._pending = set(self.keys()) if self._key_funcs else set()
+
+    @classmethod
+    def from_grouped(cls, d: dict[K, Iterable[T]], collection_type: typing.Type[GroupCollection[T]], key_funcs: typing.Sequence[Callable[[T], K]]) -> LazyNestedGroups[T]:
+        """Create lazy groups from a dictionary of groups that are further grouped by key_funcs (one per level) on access."""
+        return cls({k: collection_type(v) for k, v in d.items()}, key_funcs)
+
+    @property
+    def pending(self) -> set[K]:
+        """Keys whose groups have not been grouped by the next level yet."""
+        return set(self._pending)
+
+    def __getitem__(self, key: K) -> LazyNestedGroups[T]|GroupCollection[T]:
+        value = super().__getitem__(key)
+        if key in self._pending:
+            key_func, *rest = self._key_funcs
+            value = self.from_grouped(_groupby(value, key_func), value.__class__, rest)
+            super().__setitem__(key, value)
+            self._pending.discard(key)
+        return value
+
+    def __setitem__(self, key: K, value: LazyNestedGroups[T]|GroupCollection[T]) -> None:
+        super().__setitem__(key, value)
+        self._pending.discard(key)
+
+    def __delitem__(self, key: K) -> None:
+        super().__delitem__(key)
+        self._pending.discard(key)
+
+    def __iter__(self) -> Iterator[K]:
+        # overriding __iter__ stops dict() and ** unpacking from copying the raw storage, 
+        # so they read values through __getitem__ instead
+        return super().__iter__()
+
+    def get(self, key: K, default: V = None) -> LazyNestedGroups[T]|GroupCollection[T]|V:
+        return self[key] if key in self else default
+
+    def setdefault(self, key: K, default: V = None) -> LazyNestedGroups[T]|GroupCollection[T]|V:
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, other: Any = (), /, **kwargs) -> None:
+        collections.abc.MutableMapping.update(self, other, **kwargs)
+
+    def copy(self) -> LazyNestedGroups[T]:
+        """Return a shallow copy that keeps pending keys pending."""
+        new = self.__class__(dict.items(self), self._key_funcs)
+        new._pending = set(self._pending)
+        return new
+
+    def __or__(self, other: Any) -> LazyNestedGroups[T]:
+        if not isinstance(other, dict):
+            return NotImplemented
+        new = self.copy()
+        new.update(other)
+        return new
+
+    def __ror__(self, other: Any) -> dict:
+        if not isinstance(other, dict):
+            return NotImplemented
+        new = dict(other)
+        new.update(self.items())
+        return new
+
+    def __ior__(self, other: Any) -> LazyNestedGroups[T]:
+        self.update(other)
+        return self
+
+    def items(self) -> collections.abc.ItemsView:
+        return collections.abc.ItemsView(self)
+
+    def values(self) -> collections.abc.ValuesView:
+        return collections.abc.ValuesView(self)
+
+    def pop(self, key: K, *default) -> LazyNestedGroups[T]|GroupCollection[T]:
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return super().pop(key, *default)
+
+    def popitem(self) -> tuple[K, LazyNestedGroups[T]|GroupCollection[T]]:
+        if not self:
+            raise KeyError('popitem(): dictionary is empty')
+        key = next(reversed(dict.keys(self)))
+        return key, self.pop(key)
+
+    def __eq__(self, other: Any) -> bool:
+        for key in list(self._pending):
+            self[key]
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        shown = {k: (f'<{len(v)} ungrouped>' if k in self._pending else v) for k, v in dict.items(self)}
+        return f'{self.__class__.__name__}({shown})'
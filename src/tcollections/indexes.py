@@ -0,0 +1,90 @@
+import typing
+import dataclasses
+import bisect
+
+
+T = typing.TypeVar('T')
+K = typing.TypeVar('K', bound=typing.Hashable)
+
+
+@dataclasses.dataclass
+class IndexStats:
+    '''Usage counters for a list index.'''
+    builds: int = 0
+    hits: int = 0
+    misses: int = 0
+
+
+class ListIndex(typing.Generic[K, T]):
+    '''Hash index from the keys of list elements to their positions in the list.
+        Unique indexes map each key to one position, others map each key to a list of positions in order.
+    '''
+    def __init__(self, key_func: typing.Callable[[T], K], unique: bool = False, stats: IndexStats|None = None):
+        self.key_func = key_func
+        self.unique = unique
+        self.stats = stats if stats is not None else IndexStats()
+        self.positions: dict[K, int|list[int]] = {}
+
+    def build(self, elements: typing.Sequence[T]) -> None:
+        '''Index all elements of the list from scratch.'''
+        self.positions = {}
+        for i, e in enumerate(elements):
+            self.add(e, i)
+        self.stats.builds += 1
+
+    def add(self, element: T, position: int) -> None:
+        '''Index an element stored at a position.'''
+        key = self.key_func(element)
+        if self.unique:
+            if key in self.positions:
+                raise ValueError(f'Duplicate key {key!r} in unique index.')
+            self.positions[key] = position
+        elif key in self.positions:
+            positions = self.positions[key]
+            if positions[-1] < position:
+                positions.append(position)
+            else:
+                bisect.insort(positions, position)
+        else:
+            self.positions[key] = [position]
+
+    def replace(self, old: T, new: T, position: int) -> None:
+        '''Re-index the element at a position when old is replaced by new. 
+            Raises ValueError without changing the index if new would duplicate a key of a unique index.
+        '''
+        old_key, new_key = self.key_func(old), self.key_func(new)
+        if old_key == new_key:
+            return
+        if self.unique:
+            if new_key in self.positions:
+                raise ValueError(f'Duplicate key {new_key!r} in unique index.')
+            del self.positions[old_key]
+            self.positions[new_key] = position
+            return
+        self.remove(old, position)
+        if new_key in self.positions:
+            bisect.insort(self.positions[new_key], position)
+        else:
+            self.positions[new_key] = [position]
+
+    def remove(self, element: T, position: int) -> None:
+        '''Remove an element stored at a position from the index.'''
+        key = self.key_func(element)
+        if self.unique:
+            del self.positions[key]
+        else:
+            positions = self.positions[key]
+            positions.remove(position)
+            if not positions:
+                del self.positions[key]
+
+    def get(self, key: K) -> list[int]:
+        '''Return the positions of the elements with a key, recording a hit or miss.'''
+        try:
+            positions = self.positions[key]
+        except KeyError:
+            self.stats.misses += 1
+            return []
+        self.stats.hits += 1
+        return [positions] if self.unique else positions
+
@@ -0,0 +1,46 @@
+import typing
+
+
+K = typing.TypeVar('K', bound=typing.Hashable)
+
+
+class KeyCodec(typing.Generic[K]):
+    '''Dictionary encoding of group keys. Each level maps its distinct key values to small integer codes 
+        in order of first appearance, and stores one instance of each value to decode codes back to keys.
+    '''
+    def __init__(self):
+        self.codes: list[dict[K, int]] = []
+        self.values: list[list[K]] = []
+
+    def encode(self, keys: tuple[K, ...]) -> tuple[int, ...]:
+        '''Return the code tuple of a key tuple, assigning codes to values not seen before.'''
+        while len(self.codes) < len(keys):
+            self.codes.append({})
+            self.values.append([])
+        codes = []
+        for key, level_codes, level_values in zip(keys, self.codes, self.values):
+            code = level_codes.get(key)
+            if code is None:
+                code = level_codes[key] = len(level_values)
+                level_values.append(key)
+            codes.append(code)
+        return tuple(codes)
+
+    def lookup(self, keys: tuple[K, ...]) -> tuple[int, ...]:
+        '''Return the code tuple of a key tuple without assigning new codes. 
+            Raises KeyError for unseen values and for key tuples that do not have one key per level.
+        '''
+        if len(keys) != len(self.codes):
+            raise KeyError(keys)
+        try:
+            return tuple(level_codes[key] for key, level_codes in zip(keys, self.codes))
+        except KeyError:
+            raise KeyError(keys) from None
+
+    def decode(self, codes: tuple[int, ...]) -> tuple[K, ...]:
+        '''Return the key tuple of a code tuple.'''
+        return tuple(level_values[code] for code, level_values in zip(codes, self.values))
+
+    def cardinality(self) -> list[int]:
+        '''Return the number of distinct values at each level.'''
+        return [len(level_values) for level_values in self.values]
@@ -0,0 +1,136 @@
+from __future__ import annotations
+import typing
+import dataclasses
+import collections
+import heapq
+import itertools
+import sys
+import types
+
+
+DEFAULT_SAMPLE_SIZE = 10_000 # elements measured per collection before extrapolating
+DEFAULT_TOP = 10
+
+_ATOMIC_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+@dataclasses.dataclass
+class LevelMemory:
+    '''Bytes used by one level of a grouping.'''
+    keys: int = 0
+    containers: int = 0
+    elements: int = 0
+    groups: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.keys + self.containers + self.elements
+
+
+@dataclasses.dataclass
+class MemoryUsage:
+    '''Report of the bytes used by a collection or grouping.
+        keys: bytes of the group keys.
+        containers: bytes of the collection and grouping objects themselves (excluding what they contain).
+        elements: bytes of the elements, including the objects they reference if deep.
+        levels: breakdown for each level of a grouping, where level i holds the i-th keys of the key paths.
+        top_groups: (key, bytes) of the heaviest groups, heaviest first. Keys are key paths for nested groups.
+        sampled: True if some element sizes were extrapolated from a sample.
+    '''
+    keys: int = 0
+    containers: int = 0
+    elements: int = 0
+    levels: list[LevelMemory] = dataclasses.field(default_factory=list)
+    top_groups: list[tuple[typing.Hashable, int]] = dataclasses.field(default_factory=list)
+    sampled: bool = False
+
+    @property
+    def total(self) -> int:
+        return self.keys + self.containers + self.elements
+
+
+def collection_memory_usage(collection: typing.Collection, deep: bool = False, sample_size: int = DEFAULT_SAMPLE_SIZE) -> MemoryUsage:
+    '''Measure the memory used by a collection and its elements.'''
+    seen = {}
+    elements, sampled = _elements_size(collection, deep, sample_size, seen)
+    return MemoryUsage(containers=sys.getsizeof(collection), elements=elements, sampled=sampled)
+
+
+def groups_memory_usage(groups: typing.Any, deep: bool = False, top: int = DEFAULT_TOP, sample_size: int = DEFAULT_SAMPLE_SIZE) -> MemoryUsage:
+    '''Measure the memory used by a grouping, broken down by level and by group.'''
+    seen = {}
+    usage = MemoryUsage()
+    def level(i: int) -> LevelMemory:
+        while len(usage.levels) <= i:
+            usage.levels.append(LevelMemory())
+        return usage.levels[i]
+
+    for key_path, node in groups.iter_nodes():
+        lvl = level(len(key_path))
+        lvl.containers += sys.getsizeof(node)
+        for key in node.keys():
+            lvl.keys += _deep_sizeof(key, seen) if deep else sys.getsizeof(key)
+
+    group_sizes = []
+    for key_path, group in groups.iter_leaves():
+        lvl = level(len(key_path) - 1)
+        container = sys.getsizeof(group)
+        elements, sampled = _elements_size(group, deep, sample_size, seen)
+        lvl.containers += container
+        lvl.elements += elements
+        lvl.groups += 1
+        usage.sampled = usage.sampled or sampled
+        group_sizes.append((key_path if len(key_path) > 1 else key_path[0], container + elements))
+
+    usage.keys = sum(l.keys for l in usage.levels)
+    usage.containers = sum(l.containers for l in usage.levels)
+    usage.elements = sum(l.elements for l in usage.levels)
+    usage.top_groups = heapq.nlargest(top, group_sizes, key=lambda ks: ks[1])
+    return usage
+
+
+def _elements_size(collection: typing.Collection, deep: bool, sample_size: int, seen: dict[int, typing.Any]) -> tuple[int, bool]:
+    '''Return the bytes used by the elements of a collection, extrapolated from a sample of at most sample_size
+        elements, and whether sampling was used.
+    '''
+    n = len(collection)
+    if n > sample_size:
+        if isinstance(collection, typing.Sequence):
+            step = n / sample_size
+            sample = (collection[int(i * step)] for i in range(sample_size))
+        else:
+            sample = itertools.islice(collection, sample_size)
+        size = sum(_deep_sizeof(e, seen) if deep else sys.getsizeof(e) for e in sample)
+        return int(size * n / sample_size), True
+    return sum(_deep_sizeof(e, seen) if deep else sys.getsizeof(e) for e in collection), False
+
+
+def _deep_sizeof(obj: typing.Any, seen: dict[int, typing.Any]) -> int:
+    '''Return the size of an object and everything it references that is not in seen, without recursion.
+        Adds the measured objects to seen, keyed by id, so that shared objects and cycles are counted once 
+        (keeping them referenced so their ids cannot be reused while measuring).
+    '''
+    size = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen[id(o)] = o
+        size += sys.getsizeof(o)
+        if isinstance(o, _ATOMIC_TYPES):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, collections.deque)):
+            stack.extend(o)
+        if hasattr(o, '__dict__'):
+            stack.append(o.__dict__)
+        for cls in type(o).__mro__:
+            slots = getattr(cls, '__slots__', ())
+            for slot in ((slots,) if isinstance(slots, str) else slots):
+                if hasattr(o, slot):
+                    stack.append(getattr(o, slot))
+    return size
+
@@ -0,0 +1,84 @@
+from __future__ import annotations
+import typing
+import dataclasses
+import array
+import collections
+import functools
+
+
+R = typing.TypeVar('R', bound=typing.Hashable)
+C = typing.TypeVar('C', bound=typing.Hashable)
+T = typing.TypeVar('T')
+
+
+@dataclasses.dataclass
+class Pivot(typing.Generic[R, C]):
+    '''A dense two-dimensional table of values with row and column labels, stored row-major in a flat array.'''
+    rows: list[R]
+    columns: list[C]
+    values: array.array
+
+    @classmethod
+    def from_cells(cls, cells: typing.Iterable[tuple[R, C, typing.Any]], fill: typing.Any = 0, typecode: str = 'd') -> Pivot[R, C]:
+        '''Create a table from (row, column, value) triples. Labels are ordered by first appearance and
+            cells without a value are set to fill.
+        '''
+        row_index, column_index, indexed = {}, {}, []
+        for row, column, value in cells:
+            r = row_index.setdefault(row, len(row_index))
+            c = column_index.setdefault(column, len(column_index))
+            indexed.append((r, c, value))
+        n_columns = len(column_index)
+        values = array.array(typecode, [fill]) * (len(row_index) * n_columns)
+        for r, c, value in indexed:
+            values[r * n_columns + c] = value
+        return cls(list(row_index), list(column_index), values)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        '''The number of rows and columns.'''
+        return len(self.rows), len(self.columns)
+
+    def get(self, row: R, column: C) -> typing.Any:
+        '''Return the value of a cell by its labels.'''
+        return self.values[self._row_positions[row] * len(self.columns) + self._column_positions[column]]
+
+    @functools.cached_property
+    def _row_positions(self) -> dict[R, int]:
+        return {row: i for i, row in enumerate(self.rows)}
+
+    @functools.cached_property
+    def _column_positions(self) -> dict[C, int]:
+        return {column: i for i, column in enumerate(self.columns)}
+
+    def to_dict(self) -> dict[R, dict[C, typing.Any]]:
+        '''Convert to a dictionary of rows, each a dictionary mapping column labels to values.'''
+        n = len(self.columns)
+        return {row: dict(zip(self.columns, self.values[i * n:(i + 1) * n])) for i, row in enumerate(self.rows)}
+
+    def to_numpy(self) -> 'numpy.ndarray':
+        '''Return the values as a two-dimensional NumPy array that shares memory with the flat array.'''
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError('Pivot.to_numpy requires numpy to be installed.') from e
+        return numpy.frombuffer(self.values, dtype=self.values.typecode).reshape(self.shape)
+
+
+def _crosstab(iterable: typing.Iterable[T], key_func: typing.Callable[[T], tuple[R, C]]) -> Pivot[R, C]:
+    '''Count the elements for each (row, column) pair of keys without grouping the elements themselves.
+
+    Args:
+        iterable: The collection to count.
+        key_func: A function that returns a (row, column) tuple of keys for an element.
+
+    Returns:
+        A Pivot of integer counts where missing combinations are zero.
+
+    Example:
+        >>> result = _crosstab(['ab', 'ac', 'bc', 'ab'], lambda x: (x[0], x[1]))
+        >>> # Result rows: ['a', 'b'], columns: ['b', 'c'], values: [2, 1, 0, 1]
+    '''
+    counts = collections.Counter(map(key_func, iterable))
+    return Pivot.from_cells(((row, column, n) for (row, column), n in counts.items()), fill=0, typecode='q')
+
@@ -0,0 +1,42 @@
+import typing
+import json
+import csv
+import os
+
+
+DEFAULT_CHUNKSIZE = 1 << 20 # bytes
+
+
+def iter_ndjson(path: str|os.PathLike, chunksize: int = DEFAULT_CHUNKSIZE, encoding: str = 'utf-8') -> typing.Iterator[typing.Any]:
+    '''Iterate over the records of a newline-delimited JSON file, reading about chunksize bytes at a time.
+
+    Args:
+        path: Path to the file.
+        chunksize: Approximate number of bytes to read from the file at once.
+        encoding: Text encoding of the file.
+
+    Returns:
+        An iterator of the parsed records. Blank lines are skipped.
+    '''
+    with open(path, 'r', encoding=encoding, buffering=chunksize) as f:
+        while lines := f.readlines(chunksize):
+            for line in lines:
+                if not line.isspace():
+                    yield json.loads(line)
+
+
+def iter_csv(path: str|os.PathLike, chunksize: int = DEFAULT_CHUNKSIZE, encoding: str = 'utf-8', **reader_kwargs) -> typing.Iterator[dict[str, str]]:
+    '''Iterate over the rows of a CSV file as dictionaries, reading through a buffer of chunksize bytes.
+
+    Args:
+        path: Path to the file.
+        chunksize: Size of the read buffer in bytes.
+        encoding: Text encoding of the file.
+        reader_kwargs: Passed to csv.DictReader (e.g. fieldnames, delimiter).
+
+    Returns:
+        An iterator of rows, each a dictionary mapping column names to string values.
+    '''
+    with open(path, 'r', encoding=encoding, newline='', buffering=chunksize) as f:
+        yield from csv.DictReader(f, **reader_kwargs)
+
@@ -0,0 +1,144 @@
+from __future__ import annotations
+import typing
+import dataclasses
+import array
+import pickle
+import sys
+from multiprocessing import shared_memory
+
+from .typed_collections import TypedCollection, tview
+from .groups import GroupsBase
+
+
+T = typing.TypeVar('T')
+
+_ALIGNMENT = 8
+
+
+@dataclasses.dataclass(frozen=True)
+class _ArrayRef:
+    '''Placeholder for a numeric collection stored as a raw buffer in the shared memory block.'''
+    typecode: str
+    offset: int
+    nbytes: int
+
+
+@dataclasses.dataclass
+class SharedCollection(typing.Generic[T]):
+    '''Handle to a collection or grouping stored in a shared memory block.
+
+    The handle itself is small and cheap to pickle, so it can be sent to worker processes, which call attach()
+    to get read-only views of the data without copying it. Collections of only ints or only floats are stored
+    as raw buffers and attached as tview objects over the shared memory. Other collections are stored with
+    pickle protocol 5, so objects that support out-of-band buffers (e.g. NumPy arrays) are also attached
+    without copying, while plain Python objects are rebuilt from shared memory.
+
+    Every process should call close() (or use the handle as a context manager) after dropping its views,
+    and the creating process should call unlink() once no process needs the data anymore. Using the handle
+    returned by to_shared() as a context manager does both.
+    '''
+    name: str
+    payload: tuple[int, int]
+    buffers: tuple[tuple[int, int], ...]
+    owner: bool = dataclasses.field(default=False, compare=False)
+    _shm: shared_memory.SharedMemory|None = dataclasses.field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def create(cls, collection: TypedCollection[T]|GroupsBase[T]) -> SharedCollection[T]:
+        '''Copy a collection or grouping into a new shared memory block.'''
+        chunks = []
+        size = 0
+        def add_chunk(data: memoryview) -> tuple[int, int]:
+            nonlocal size
+            offset = -(-size // _ALIGNMENT) * _ALIGNMENT
+            chunks.append((offset, data))
+            size = offset + data.nbytes
+            return offset, data.nbytes
+
+        def encode(c: typing.Any) -> typing.Any:
+            arr = _to_array(c)
+            if arr is None:
+                return c
+            return _ArrayRef(arr.typecode, *add_chunk(memoryview(arr).cast('B')))
+
+        if isinstance(collection, GroupsBase):
+            structure = collection._map_leaves(encode)
+        else:
+            structure = encode(collection)
+        oob = []
+        payload = pickle.dumps(structure, protocol=5, buffer_callback=oob.append)
+        buffers = tuple(add_chunk(b.raw()) for b in oob)
+        payload = add_chunk(memoryview(payload))
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for offset, data in chunks:
+            shm.buf[offset:offset + data.nbytes] = data
+        handle = cls(shm.name, payload, buffers, owner=True)
+        handle._shm = shm
+        return handle
+
+    def attach(self) -> TypedCollection[T]|GroupsBase[T]:
+        '''Return read-only views of the shared data, opening the shared memory block if needed.'''
+        buf = self._open().buf.toreadonly()
+        offset, nbytes = self.payload
+        structure = pickle.loads(buf[offset:offset + nbytes], buffers=[buf[o:o + n] for o, n in self.buffers])
+
+        def decode(c: typing.Any) -> typing.Any:
+            if isinstance(c, _ArrayRef):
+                return tview(buf[c.offset:c.offset + c.nbytes].cast(c.typecode))
+            return c
+
+        if isinstance(structure, GroupsBase):
+            return structure._map_leaves(decode)
+        return decode(structure)
+
+    def close(self) -> None:
+        '''Close this process's access to the shared memory block. All attached views must be dropped first.'''
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def unlink(self) -> None:
+        '''Destroy the shared memory block. Should be called once, by the process that created it.'''
+        shm = self._open()
+        self.close()
+        shm.unlink()
+
+    def _open(self) -> shared_memory.SharedMemory:
+        if self._shm is None:
+            if sys.version_info >= (3, 13) and not self.owner:
+                self._shm = shared_memory.SharedMemory(self.name, track=False)
+            else:
+                self._shm = shared_memory.SharedMemory(self.name)
+        return self._shm
+
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        state['_shm'] = None
+        state['owner'] = False
+        return state
+
+    def __enter__(self) -> typing.Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.owner:
+            self.unlink()
+        else:
+            self.close()
+
+
+def _to_array(collection: typing.Any) -> array.array|None:
+    '''Return the elements as an array.array if they are all ints or all floats, otherwise None.'''
+    if not isinstance(collection, TypedCollection):
+        return None
+    types = set(map(type, collection))
+    if types == {int}:
+        try:
+            return array.array('q', collection)
+        except OverflowError:
+            return None
+    if types == {float}:
+        return array.array('d', collection)
+    return None
+
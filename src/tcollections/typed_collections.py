@@ -2,7 +2,10 @@ from __future__ import annotations
 import typing
 import dataclasses
 import collections
+import itertools
 import abc
+import os
+import weakref
 from typing import Any
 
 from typing import TypeVar, Generic, Callable, Any
@@ -12,11 +15,25 @@ from collections.abc import Iterable, Hashable
 from .group_funcs_lowlevel import (
     _groupby_multi, 
     _groupby,
+    _groupby_multi_batched,
+    _groupby_batched,
+    _groupby_sampled,
+    _check_sample,
+    _groupby_encoded,
+    _iter_key_batches,
+    DEFAULT_BATCH_SIZE,
 )
-from .groups import Groups, NestedGroups
+from .groups import Groups, NestedGroups, LazyNestedGroups, EncodedGroups
+from .keys import KeyCodec
+from .readers import iter_ndjson, iter_csv, DEFAULT_CHUNKSIZE
+from .indexes import ListIndex, IndexStats
+from .external_sort import iter_sorted_external, DEFAULT_RUN_SIZE
+from .pivot import Pivot, _crosstab
+from .memory import MemoryUsage, collection_memory_usage, DEFAULT_SAMPLE_SIZE
 
 if typing.TYPE_CHECKING:
     from .chain import ChainFunc
+    from .shared import SharedCollection
 
 
 
@@ -39,6 +56,16 @@ class TypedCollection(abc.ABC, typing.Generic[T]):
         '''All collections must be iterable.'''
         pass
 
+    @classmethod
+    def from_ndjson(cls, path: str|os.PathLike, chunksize: int = DEFAULT_CHUNKSIZE, encoding: str = 'utf-8') -> typing.Self:
+        '''Create a collection from the records of a newline-delimited JSON file, parsed as it is read in chunks.'''
+        return cls(iter_ndjson(path, chunksize=chunksize, encoding=encoding))
+
+    @classmethod
+    def from_csv(cls, path: str|os.PathLike, chunksize: int = DEFAULT_CHUNKSIZE, encoding: str = 'utf-8', **reader_kwargs) -> typing.Self:
+        '''Create a collection of row dictionaries from a CSV file, parsed as it is read in chunks.'''
+        return cls(iter_csv(path, chunksize=chunksize, encoding=encoding, **reader_kwargs))
+
     @property
     def group(self) -> Grouper[T]:
         '''Access grouping operations for this set.'''
@@ -52,10 +79,49 @@ class TypedCollection(abc.ABC, typing.Generic[T]):
         '''Filter the list by a function.'''
         return self.__class__(filter(func, self))
 
+    def iter_chunks(self, n: int) -> typing.Iterator[tview[T]|tlist[T]]:
+        '''Iterate over consecutive chunks of at most n elements. Chunks of sequences (e.g. tlist) are tview 
+            objects that do not copy the elements; other collections are consumed into a new tlist per chunk.
+        '''
+        if n < 1:
+            raise ValueError(f'Chunk size must be positive, not {n}.')
+        if isinstance(self, tview):
+            return (self[i:i + n] for i in range(0, len(self), n))
+        if isinstance(self, collections.abc.Sequence):
+            return (tview(self, i, i + n) for i in range(0, len(self), n))
+        it = iter(self)
+        return iter(lambda: tlist(itertools.islice(it, n)), tlist())
+
     def value_counts(self) -> collections.Counter[T]:
         '''Return a counter of the elements in the list.'''
         return collections.Counter(self)
 
+    def take(self, n: int) -> typing.Self:
+        '''Return the first n elements, consuming no more of the collection than needed.'''
+        return self.__class__(itertools.islice(self, n))
+
+    def first(self, default: V = DEFAULT_VALUE) -> T|V:
+        '''Return the first element, or default if the collection is empty.'''
+        for e in self:
+            return e
+        if default is DEFAULT_VALUE:
+            raise ValueError(f'first() of an empty {self.__class__.__name__}.')
+        return default
+
+    def find(self, func: abc.Callable[[T], bool], default: V = None) -> T|V:
+        '''Return the first element for which func is true, or default if there is none.'''
+        for e in self:
+            if func(e):
+                return e
+        return default
+
+    def any(self, func: abc.Callable[[T], bool]|None = None) -> bool:
+        '''Return True if func is true for any element (or any element is truthy), stopping at the first match.'''
+        for e in self:
+            if (e if func is None else func(e)):
+                return True
+        return False
+
     def copy(self) -> typing.Self:
         '''Return a shallow copy of the list.'''
         return self.__class__(self)
@@ -72,6 +138,18 @@ class TypedCollection(abc.ABC, typing.Generic[T]):
             value = func(value, e)
         return value
 
+    def memory_usage(self, deep: bool = False, sample_size: int = DEFAULT_SAMPLE_SIZE) -> MemoryUsage:
+        '''Report the bytes used by the collection and its elements. If deep, objects referenced by the elements 
+            are included (shared objects and cycles are counted once). Element sizes are extrapolated from a 
+            sample of sample_size elements for larger collections.
+        '''
+        return collection_memory_usage(self, deep=deep, sample_size=sample_size)
+
+    def to_shared(self) -> SharedCollection[T]:
+        '''Copy the collection into shared memory, returning a handle that worker processes can attach to without copying.'''
+        from .shared import SharedCollection
+        return SharedCollection.create(self)
+
     def __rshift__(self, chain_func: ChainFunc) -> typing.Self:
         '''Pipe the collection into a function or another collection.'''
         return chain_func(self)
@@ -84,18 +162,50 @@ class TypedCollection(abc.ABC, typing.Generic[T]):
 class tlist(list[T], TypedCollection[T]):
     '''A list of elements with a homogenous type.'''
     
-    def sort(self, key: typing.Callable[[T], typing.Any] = None, reverse: bool = False) -> typing.Self:
-        '''Sort the list, returning a new list.'''
+    def sort(self, 
+        key: typing.Callable[[T], typing.Any] = None, 
+        reverse: bool = False, 
+        external: bool = False, 
+        run_size: int = DEFAULT_RUN_SIZE, 
+        tmpdir: str|os.PathLike|None = None,
+    ) -> typing.Self:
+        '''Sort the list, returning a new list. If external is True, sorted runs of run_size elements are 
+            written to temporary files in tmpdir and merged, so only one run is sorted in memory at a time.
+        '''
+        if external:
+            return self.__class__(iter_sorted_external(self, key=key, reverse=reverse, run_size=run_size, tmpdir=tmpdir))
         return self.__class__(sorted(self, key = key, reverse = reverse))
 
+    def copy(self) -> typing.Self:
+        '''Return a shallow copy of the list as a tlist (list.copy would return a plain list).'''
+        return self.__class__(self)
+
     def reverse(self) -> typing.Self:
         '''Return a reversed version of the list. Overwrites list reverse, which executes in-place.'''
         return self.__class__(reversed(self))
 
+    def view(self, reverse: bool = False) -> cowlist[T]:
+        '''Return a copy-on-write copy of the list (reversed if reverse), which shares this list's elements until 
+            either list is modified. Concatenating views with + also shares the elements of both operands.
+        '''
+        return cowlist._view([(self, reverse)])
+
     def to_set(self) -> 'tset[T]':
         '''Convert this tlist to a tset.'''
         return tset(self)
 
+    def to_numpy(self, dtype: typing.Any = None) -> 'numpy.ndarray':
+        '''Convert this tlist to a NumPy array. If a dtype is given, the array is pre-sized and filled in one pass. 
+            Requires numpy.
+        '''
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError('to_numpy requires numpy to be installed.') from e
+        if dtype is None:
+            return numpy.array(self)
+        return numpy.fromiter(self, dtype=dtype, count=len(self))
+
     def __add__(self, other: typing.Self) -> typing.Self:
         '''Concatenate two tlists.'''
         return self.__class__(super().__add__(other))
@@ -107,8 +217,373 @@ class tlist(list[T], TypedCollection[T]):
     def __mul__(self, n: int) -> typing.Self:
         '''Multiply the list by an integer.'''
         return self.__class__(super().__mul__(n))
+
+    ############################## Indexing ##############################
+    _index: ListIndex|None = None
+    _index_stale: bool = False
+
+    def index_by(self, key_func: typing.Callable[[T], K], unique: bool = False) -> ListIndex[K, T]:
+        '''Build and cache a hash index of the elements by key, used by lookup and lookup_many. 
+            The index is maintained by append, extend and item assignment, and is rebuilt on the next lookup 
+            after any other in-place change (the list switches to a subclass whose mutators do this, so lists 
+            without an index keep the built-in mutators). Calling again with the same arguments reuses the cached index.
+            With a unique index, changes that would give two elements the same key raise ValueError and leave 
+            the list unchanged.
+        '''
+        self._track_mutations()
+        if self._index is None or self._index.key_func is not key_func or self._index.unique != unique:
+            stats = self._index.stats if self._index is not None else None
+            self._index = ListIndex(key_func, unique, stats)
+            self._index_stale = True
+        return self._current_index()
+
+    def lookup(self, key: K) -> T|typing.Self:
+        '''Return the element with a key if the index is unique (raising KeyError if there is none), 
+            otherwise a tlist of the elements with the key.
+        '''
+        index = self._current_index()
+        positions = index.get(key)
+        if index.unique:
+            if not positions:
+                raise KeyError(key)
+            return super().__getitem__(positions[0])
+        return self.__class__(map(super().__getitem__, positions))
+
+    def lookup_many(self, keys: Iterable[K]) -> typing.Self:
+        '''Return a tlist of the elements with any of the keys, in the order of the keys. Missing keys are skipped.'''
+        index = self._current_index()
+        getitem = super().__getitem__
+        return self.__class__(getitem(i) for key in keys for i in index.get(key))
+
+    @property
+    def index_stats(self) -> IndexStats:
+        '''Usage counters (builds, hits and misses) of the index.'''
+        return self._current_index().stats
+
+    def _current_index(self) -> ListIndex[K, T]:
+        if self._index is None:
+            raise ValueError('This tlist has no index. Call index_by first.')
+        if self._index_stale:
+            self._index.build(self)
+            self._index_stale = False
+        return self._index
+
+    def _invalidate_index(self) -> None:
+        if self._index is not None:
+            self._index_stale = True
+
+    def _index_is_current(self) -> bool:
+        return self._index is not None and not self._index_stale
+
+    def _check_unique(self, added: typing.Sequence[T], removed: typing.Sequence[T] = ()) -> None:
+        '''Raise ValueError if adding elements (after removing others) would duplicate a key of a unique index.
+            Brings the index up to date so that later changes can maintain it.
+        '''
+        if self._index is None or not self._index.unique:
+            return
+        index = self._current_index()
+        key_func = index.key_func
+        removed_keys = {key_func(e) for e in removed}
+        seen = set()
+        for element in added:
+            key = key_func(element)
+            if key in seen or (key in index.positions and key not in removed_keys):
+                raise ValueError(f'Duplicate key {key!r} in unique index.')
+            seen.add(key)
+
+    ############################## Mutation ##############################
+    _views: list[weakref.ref[cowlist[T]]]|None = None
+
+    def _add_view(self, ref: weakref.ref[cowlist[T]]) -> None:
+        '''Register a copy-on-write list that reads from this list, switching it to the tracked subclass.'''
+        self._track_mutations()
+        if self._views is None:
+            self._views = []
+        self._views.append(ref)
+        n = len(self._views)
+        if n >= 64 and n & (n - 1) == 0:
+            self._views = [r for r in self._views if r() is not None]
+
+    def _track_mutations(self) -> None:
+        if not isinstance(self, _TrackedMutations):
+            self.__class__ = _tracked_class(self.__class__)
+
+    def _detach_views(self) -> None:
+        '''Make the copy-on-write lists that read from this list copy its elements before it is modified.'''
+        views, self._views = self._views, None
+        for ref in views:
+            view = ref()
+            if view is not None:
+                view._materialize()
+
+    def __getstate__(self) -> dict|None:
+        # the index is not pickled (key functions are often lambdas); it is rebuilt by calling index_by
+        state = {k: v for k, v in self.__dict__.items() if k not in ('_index', '_index_stale', '_views')}
+        return state or None
     
 
+class _TrackedMutations:
+    '''Mutators for tlists with an index or copy-on-write views, which keep the index up to date and make 
+        the views copy the elements first. Mixed into a subclass of the list's class by _tracked_class, so 
+        plain tlists keep the built-in list mutators. Constructing the subclass (e.g. through self.__class__ 
+        in tlist methods) returns the plain class.
+    '''
+    _plain_class: typing.Type[tlist]
+
+    def __new__(cls, *args, **kwargs):
+        plain = cls._plain_class.__new__(cls._plain_class)
+        plain.__init__(*args, **kwargs)
+        return plain
+
+    def __reduce_ex__(self, protocol: int):
+        return (self._plain_class, (list(self),), self.__getstate__())
+
+    def append(self, element: T) -> None:
+        '''Append an element, updating the index if there is one.'''
+        if self._views:
+            self._detach_views()
+        if self._index is not None and self._index.unique:
+            self._current_index()
+        if self._index_is_current():
+            # a unique index raises on a duplicate key here, before the list is changed
+            self._index.add(element, len(self))
+        super().append(element)
+
+    def extend(self, elements: Iterable[T]) -> None:
+        '''Extend the list with elements, updating the index if there is one.'''
+        if self._views:
+            self._detach_views()
+        if self._index is not None and self._index.unique:
+            elements = list(elements)
+            self._check_unique(elements)
+        start = len(self)
+        super().extend(elements)
+        if self._index_is_current():
+            for i in range(start, len(self)):
+                self._index.add(super().__getitem__(i), i)
+
+    def __iadd__(self, elements: Iterable[T]) -> typing.Self:
+        self.extend(elements)
+        return self
+
+    def __setitem__(self, index: int|slice, value: T|Iterable[T]) -> None:
+        if self._views:
+            self._detach_views()
+        if isinstance(index, slice):
+            if self._index is not None and self._index.unique:
+                value = list(value)
+                self._check_unique(value, super().__getitem__(index))
+            super().__setitem__(index, value)
+            self._invalidate_index()
+            return
+        if self._index is not None and self._index.unique:
+            self._current_index()
+        if not self._index_is_current():
+            super().__setitem__(index, value)
+            self._invalidate_index()
+            return
+        i = range(len(self))[index]
+        self._index.replace(super().__getitem__(i), value, i)
+        super().__setitem__(i, value)
+
+    def __delitem__(self, index: int|slice) -> None:
+        if self._views:
+            self._detach_views()
+        super().__delitem__(index)
+        self._invalidate_index()
+
+    def __imul__(self, n: int) -> typing.Self:
+        if self._views:
+            self._detach_views()
+        if n > 1:
+            self._check_unique(list(self) * (n - 1))
+        super().__imul__(n)
+        self._invalidate_index()
+        return self
+
+    def insert(self, index: int, element: T) -> None:
+        if self._views:
+            self._detach_views()
+        self._check_unique([element])
+        super().insert(index, element)
+        self._invalidate_index()
+
+    def pop(self, index: int = -1) -> T:
+        if self._views:
+            self._detach_views()
+        element = super().pop(index)
+        self._invalidate_index()
+        return element
+
+    def remove(self, element: T) -> None:
+        if self._views:
+            self._detach_views()
+        super().remove(element)
+        self._invalidate_index()
+
+    def clear(self) -> None:
+        if self._views:
+            self._detach_views()
+        super().clear()
+        self._invalidate_index()
+
+
+_tracked_classes: dict[type, type] = {}
+
+def _tracked_class(cls: typing.Type[tlist]) -> type:
+    '''Return the subclass of a tlist class with _TrackedMutations mixed in, creating it on first use.'''
+    if cls not in _tracked_classes:
+        namespace = {'_plain_class': cls, '__module__': cls.__module__, '__qualname__': cls.__qualname__}
+        _tracked_classes[cls] = type(cls)(cls.__name__, (_TrackedMutations, cls), namespace)
+    return _tracked_classes[cls]
+
+
+class cowlist(TypedCollection[T], collections.abc.MutableSequence):
+    '''A copy-on-write list, returned by tlist.view. 
+        It reads through to the tlists it was made from (forwards or reversed) and copies their elements into 
+        a list of its own only when it is first modified or when one of those tlists is about to be modified.
+    '''
+
+    def __init__(self, iterable: Iterable[T] = ()):
+        self._segments: list[tuple[tlist[T], bool]]|None = None
+        self._data: list[T]|None = list(iterable)
+
+    @classmethod
+    def _view(cls, segments: list[tuple[tlist[T], bool]]) -> typing.Self:
+        '''Create a list that reads through to (tlist, reversed) segments.'''
+        view = cls.__new__(cls)
+        view._segments = segments
+        view._data = None
+        ref = weakref.ref(view)
+        for source, _ in segments:
+            source._add_view(ref)
+        return view
+
+    @property
+    def is_materialized(self) -> bool:
+        '''True once the list has its own copy of the elements.'''
+        return self._segments is None
+
+    def _materialize(self) -> list[T]:
+        if self._segments is not None:
+            self._data = list(iter(self))
+            self._segments = None
+        return self._data
+
+    ############################## Reading ##############################
+    def __iter__(self) -> typing.Iterator[T]:
+        if self._segments is None:
+            return iter(self._data)
+        return itertools.chain.from_iterable(reversed(s) if rev else s for s, rev in self._segments)
+
+    def __len__(self) -> int:
+        if self._segments is None:
+            return len(self._data)
+        return sum(len(s) for s, _ in self._segments)
+
+    def __getitem__(self, index: int|slice) -> T|typing.Self:
+        if isinstance(index, slice):
+            if self._segments is None:
+                return self.__class__(self._data[index])
+            return self.__class__(map(self._get, range(len(self))[index]))
+        if self._segments is None:
+            return self._data[index]
+        return self._get(range(len(self))[index])
+
+    def _get(self, i: int) -> T:
+        for s, rev in self._segments:
+            n = len(s)
+            if i < n:
+                return s[n - 1 - i] if rev else s[i]
+            i -= n
+        raise IndexError('cowlist index out of range')
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if not isinstance(other, (list, cowlist)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __lt__(self, other: typing.Any) -> bool:
+        if not isinstance(other, (list, cowlist)):
+            return NotImplemented
+        return list(self) < list(other)
+
+    def __le__(self, other: typing.Any) -> bool:
+        if not isinstance(other, (list, cowlist)):
+            return NotImplemented
+        return list(self) <= list(other)
+
+    def __gt__(self, other: typing.Any) -> bool:
+        if not isinstance(other, (list, cowlist)):
+            return NotImplemented
+        return list(self) > list(other)
+
+    def __ge__(self, other: typing.Any) -> bool:
+        if not isinstance(other, (list, cowlist)):
+            return NotImplemented
+        return list(self) >= list(other)
+
+    __hash__ = None
+
+    def copy(self) -> typing.Self:
+        '''Return a copy-on-write copy of the list.'''
+        return self._view(_cow_segments(self))
+
+    def reverse(self) -> typing.Self:
+        '''Return a reversed copy-on-write copy of the list. Does not modify the list.'''
+        return self._view([(s, not rev) for s, rev in reversed(_cow_segments(self))])
+
+    def __add__(self, other: typing.Sequence[T]) -> typing.Self:
+        '''Concatenate into a copy-on-write list that reads through to both operands.'''
+        return self._view(_cow_segments(self) + _cow_segments(other))
+
+    def sort(self, *args, **kwargs) -> tlist[T]:
+        '''Sort the list, returning a new tlist. Accepts the arguments of tlist.sort.'''
+        return self.to_list().sort(*args, **kwargs)
+
+    def to_list(self) -> tlist[T]:
+        '''Copy the elements into a new tlist.'''
+        return tlist(self)
+
+    def to_set(self) -> tset[T]:
+        '''Convert the list to a tset.'''
+        return tset(self)
+
+    ############################## Writing ##############################
+    def __setitem__(self, index: int|slice, value: T|Iterable[T]) -> None:
+        self._materialize()[index] = value
+
+    def __delitem__(self, index: int|slice) -> None:
+        del self._materialize()[index]
+
+    def insert(self, index: int, element: T) -> None:
+        self._materialize().insert(index, element)
+
+    def append(self, element: T) -> None:
+        self._materialize().append(element)
+
+    def extend(self, elements: Iterable[T]) -> None:
+        self._materialize().extend(elements)
+
+    def clear(self) -> None:
+        self._segments = None
+        self._data = []
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({list(self)!r})'
+
+
+def _cow_segments(sequence: typing.Sequence[T]) -> list[tuple[tlist[T], bool]]:
+    '''Return (tlist, reversed) segments that a copy-on-write list can safely read the sequence through.'''
+    if isinstance(sequence, tlist):
+        return [(sequence, False)]
+    if isinstance(sequence, cowlist) and not sequence.is_materialized:
+        return list(sequence._segments)
+    return [(tlist(sequence), False)]
+
 
 class tset(set[T], TypedCollection[T]):
     '''A set of elements with a homogenous type.'''
@@ -117,9 +592,54 @@ class tset(set[T], TypedCollection[T]):
         '''Convert this tset to a tlist.'''
         return tlist(self)
 
+    def union_all(self, *others: typing.AbstractSet[T]) -> typing.Self:
+        '''Union of this set and any number of other sets, built by updating a copy of the largest operand.'''
+        if not all(isinstance(o, typing.AbstractSet) for o in others):
+            raise TypeError('union_all only accepts sets.')
+        largest = max((self, *others), key=len)
+        result = self.__class__(largest)
+        for o in (self, *others):
+            if o is not largest:
+                result.update(o)
+        return result
+
+    def intersect_all(self, *others: typing.AbstractSet[T]) -> typing.Self:
+        '''Intersection of this set and any number of other sets, starting from the smallest operand.'''
+        if not all(isinstance(o, typing.AbstractSet) for o in others):
+            raise TypeError('intersect_all only accepts sets.')
+        if not others:
+            return self.__class__(self)
+        operands = sorted((self, *others), key=len)
+        result = self.__class__(operands[0])
+        for o in operands[1:]:
+            if not result:
+                break
+            result.intersection_update(o)
+        return result
+
     def __or__(self, other: typing.Self) -> typing.Self:
         '''Union of two sets.'''
-        return self.__class__(super().__or__(other))
+        if not isinstance(other, typing.AbstractSet):
+            return NotImplemented
+        result = self.__class__(self)
+        result.update(other)
+        return result
+    
+    def __ior__(self, other: typing.Self) -> typing.Self:
+        '''In-place union, keeping this object and its type.'''
+        return super().__ior__(other)
+    
+    def __iand__(self, other: typing.Self) -> typing.Self:
+        '''In-place intersection, keeping this object and its type.'''
+        return super().__iand__(other)
+    
+    def __isub__(self, other: typing.Self) -> typing.Self:
+        '''In-place difference, keeping this object and its type.'''
+        return super().__isub__(other)
+    
+    def __ixor__(self, other: typing.Self) -> typing.Self:
+        '''In-place symmetric difference, keeping this object and its type.'''
+        return super().__ixor__(other)
     
     def __and__(self, other: typing.Self) -> typing.Self:
         '''Intersection of two sets.'''
@@ -131,21 +651,143 @@ class tset(set[T], TypedCollection[T]):
     
     def __xor__(self, other: typing.Self) -> typing.Self:
         '''Symmetric difference of two sets.'''
-        return self.__class__(super().__xor__(other))
+        if not isinstance(other, typing.AbstractSet):
+            return NotImplemented
+        result = self.__class__(self)
+        result.symmetric_difference_update(other)
+        return result
     
+class tview(collections.abc.Sequence, TypedCollection[T]):
+    '''A read-only view of a contiguous range of a sequence (e.g. a tlist or memoryview), created without copying it.'''
+
+    def __init__(self, data: typing.Sequence[T], start: int = 0, stop: int|None = None):
+        self._data = data
+        self._range = range(len(data))[start:stop]
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    def __getitem__(self, index: int|slice) -> T|typing.Self|tlist[T]:
+        if isinstance(index, slice):
+            r = self._range[index]
+            if r.step == 1:
+                return self.__class__(self._data, r.start, r.stop)
+            return tlist(map(self._data.__getitem__, r))
+        return self._data[self._range[index]]
+
+    def __iter__(self) -> typing.Iterator[T]:
+        return map(self._data.__getitem__, self._range)
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if not isinstance(other, typing.Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def map(self, func: abc.Callable[[T], V]) -> tlist[V]:
+        '''Map a function over the view, returning a new tlist.'''
+        return tlist(map(func, self))
+
+    def filter(self, func: abc.Callable[[T], bool]) -> tlist[T]:
+        '''Filter the view by a function, returning a new tlist.'''
+        return tlist(filter(func, self))
+
+    def take(self, n: int) -> typing.Self:
+        '''Return a view of the first n elements.'''
+        return self[:max(n, 0)]
+
+    def copy(self) -> tlist[T]:
+        '''Copy the viewed elements into a new tlist.'''
+        return tlist(self)
+
+    def to_list(self) -> tlist[T]:
+        '''Copy the viewed elements into a new tlist.'''
+        return tlist(self)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({list(self)!r})'
+
+
 class Grouper(Generic[T]):
     '''Handles grouping operations for collections through composition.'''
     
     def __init__(self, collection: Iterable[T]):
         self._collection = collection
 
-    def multi(self, key_func: Callable[[T], tuple[K, ...]]) -> NestedGroups[T]:
-        '''Group items from a collection by multiple keys using a single key function that returns a tuple of keys.'''
-        result = _groupby_multi(self._collection, key_func)
+    def multi(self, 
+        key_func: Callable[[T], tuple[K, ...]]|None = None, 
+        *, 
+        batch_key_func: Callable[[list[T]], typing.Sequence[tuple[K, ...]]]|None = None, 
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        encode_keys: bool = False,
+    ) -> NestedGroups[T]|EncodedGroups[T]:
+        '''Group items from a collection by multiple keys using a single key function that returns a tuple of keys.
+            Alternatively, batch_key_func receives lists of up to batch_size elements and returns a key tuple for each.
+            If encode_keys, the keys at each level are dictionary-encoded as small integer codes and the result is 
+            flat EncodedGroups keyed by code tuples, which can be decoded to the original keys on request.
+        '''
+        _check_key_funcs(key_func, batch_key_func)
+        if encode_keys:
+            if batch_key_func is None:
+                keyed = ((key_func(e), e) for e in self._collection)
+            else:
+                keyed = (pair for keys, batch in _iter_key_batches(self._collection, batch_key_func, batch_size) for pair in zip(keys, batch))
+            codec = KeyCodec()
+            return EncodedGroups.from_encoded(_groupby_encoded(keyed, codec.encode), tlist, codec)
+        if batch_key_func is None:
+            result = _groupby_multi(self._collection, key_func)
+        else:
+            result = _groupby_multi_batched(self._collection, batch_key_func, batch_size)
         return NestedGroups.from_dict(result, tlist)
 
-    def by(self, key_func: Callable[[T], K]) -> Groups[T, tlist[T]]:
-        '''Group items from a collection by a single key using a key function.'''
-        result = _groupby(self._collection, key_func)
+    def by(self, 
+        key_func: Callable[[T], K]|None = None, 
+        *, 
+        batch_key_func: Callable[[list[T]], typing.Sequence[K]]|None = None, 
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_per_group: int|None = None,
+        sample: typing.Literal['reservoir', 'first', 'last'] = 'reservoir',
+        seed: int|None = None,
+    ) -> Groups[T, tlist[T]]:
+        '''Group items from a collection by a single key using a key function.
+            Alternatively, batch_key_func receives lists of up to batch_size elements and returns a key for each, 
+            so keys can be computed by vectorized functions.
+            If max_per_group is given, at most that many items are kept per group while streaming, chosen by 
+            sample ('reservoir' for a uniform random sample using seed, 'first' or 'last'), and the total number 
+            of items seen per group is stored in the totals attribute of the result.
+        '''
+        _check_key_funcs(key_func, batch_key_func)
+        _check_sample(sample)
+        if max_per_group is not None:
+            if batch_key_func is None:
+                keyed = ((key_func(e), e) for e in self._collection)
+            else:
+                keyed = (pair for keys, batch in _iter_key_batches(self._collection, batch_key_func, batch_size) for pair in zip(keys, batch))
+            result, totals = _groupby_sampled(keyed, max_per_group, sample, seed)
+            groups = Groups.from_dict(result, tlist)
+            groups.totals = totals
+            return groups
+        if batch_key_func is None:
+            result = _groupby(self._collection, key_func)
+        else:
+            result = _groupby_batched(self._collection, batch_key_func, batch_size)
         #return Groups({k: tlist(v) for k, v in result.items()})
-        return Groups.from_dict(result, tlist)
\ No newline at end of file
+        return Groups.from_dict(result, tlist)
+
+    def multi_lazy(self, key_funcs: typing.Sequence[Callable[[T], K]]) -> LazyNestedGroups[T]:
+        '''Group items by the first key function, with one key function per level. Each deeper level of a 
+            subtree is grouped by the next key function only when the subtree is first accessed.
+        '''
+        if not key_funcs:
+            raise ValueError('multi_lazy requires at least one key function.')
+        result = _groupby(self._collection, key_funcs[0])
+        return LazyNestedGroups.from_grouped(result, tlist, key_funcs[1:])
+
+    def crosstab(self, key_func: Callable[[T], tuple[K, K]]) -> Pivot:
+        '''Count items by a (row, column) pair of keys into a dense table, without building a collection per cell.'''
+        return _crosstab(self._collection, key_func)
+
+def _check_key_funcs(key_func: Callable|None, batch_key_func: Callable|None) -> None:
+    if (key_func is None) == (batch_key_func is None):
+        raise ValueError('Exactly one of key_func and batch_key_func must be provided.')
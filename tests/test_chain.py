@@ -0,0 +1,96 @@
+
+import typing
+
+import pytest
+
+import sys
+sys.path.append('../src')
+import tcollections
+from tcollections import tlist, chain
+
+
+def test_short_circuit():
+    pulled = []
+    def numbers():
+        for i in range(1000):
+            pulled.append(i)
+            yield i
+
+    assert chain.source(numbers()) >> chain.filter(lambda x: x > 5) >> chain.any()
+    assert len(pulled) == 7
+
+    pulled.clear()
+    assert chain.source(numbers()) >> chain.find(lambda x: x % 7 == 3) == 3
+    assert len(pulled) == 4
+
+    pulled.clear()
+    assert (chain.source(numbers()) >> chain.take(3)).to_list() == [0, 1, 2]
+    assert len(pulled) == 3
+
+    elements = tlist(range(10))
+    assert elements >> chain.take(3) == [0, 1, 2]
+    assert isinstance(elements >> chain.take(3), tlist)
+    assert elements >> chain.first() == 0
+    assert tlist() >> chain.first(None) is None
+    with pytest.raises(ValueError):
+        tlist() >> chain.first()
+    assert elements >> chain.find(lambda x: x > 100) is None
+    assert not (elements >> chain.any(lambda x: x > 100))
+    assert elements >> chain.head(2) == [0, 1]
+
+    groups = tcollections.groupby_multi(range(20), lambda x: (x % 2, x % 3))
+    heads = groups >> chain.head(2)
+    assert isinstance(heads, tcollections.NestedGroups)
+    assert isinstance(heads[0][0], tlist)
+    assert heads.to_dict() == {k: {k2: v[:2] for k2, v in sub.items()} for k, sub in groups.to_dict().items()}
+
+def test_sort_external():
+    import random
+    rng = random.Random(0)
+    elements = tlist((rng.randrange(50), i) for i in range(1000))
+    calls = []
+    def key(x):
+        calls.append(x)
+        return x[0]
+
+    for reverse in (False, True):
+        calls.clear()
+        result = elements.sort(key=key, reverse=reverse, external=True, run_size=64)
+        assert isinstance(result, tlist)
+        assert result == sorted(elements, key=lambda x: x[0], reverse=reverse)
+        assert len(calls) == len(elements)
+
+    streamed = chain.source(iter(elements)) >> chain.sort_external(run_size=100)
+    assert isinstance(streamed, chain.source)
+    assert streamed.to_list() == sorted(elements)
+    assert tlist([3, 1, 2]).sort(external=True) == [1, 2, 3]
+    assert tlist().sort(external=True, run_size=1) == []
+
+def test_batches():
+    elements = tlist(range(10))
+    chunks = list(elements.iter_chunks(4))
+    assert chunks == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert all(isinstance(c, tcollections.tview) for c in chunks)
+    assert list(chunks[1].iter_chunks(3)) == [[4, 5, 6], [7]]
+
+    assert list(tcollections.tset(range(5)).iter_chunks(2)) == [[0, 1], [2, 3], [4]]
+    assert list(chain.source(iter(range(5))).iter_chunks(5)) == [[0, 1, 2, 3, 4]]
+    with pytest.raises(ValueError):
+        list(elements.iter_chunks(0))
+
+    written = []
+    assert elements >> chain.batch(3) >> chain.for_each_batch(lambda b: written.append(list(b))) == 4
+    assert written == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+
+    sizes = []
+    assert chain.source(iter(range(7))) >> chain.for_each_batch(lambda b: sizes.append(len(b)), n=5) == 2
+    assert sizes == [5, 2]
+
+    with pytest.raises(ValueError):
+        elements >> chain.for_each_batch(written.append)
+
+if __name__ == '__main__':
+    test_short_circuit()
+    test_sort_external()
+    test_batches()
+
@@ -4,6 +4,7 @@ import typing
 import json
 
 import tempfile
+import time
 
 import deepdiff
 
@@ -180,6 +181,382 @@ def test_flatten_with_groupby_multi():
     print("✓ flatten with groupby_multi test passed!")
 
 
+def test_nested_groups_traversal():
+    """Test iterative traversal of NestedGroups."""
+    data = ['abc', 'abd', 'aef', 'bcd', 'bef']
+    groups = tcollections.groupby_multi(data, lambda x: (x[0], x[1]))
+
+    leaves = list(groups.iter_leaves())
+    assert [k for k, _ in leaves] == [('a', 'b'), ('a', 'e'), ('b', 'c'), ('b', 'e')]
+    assert leaves[0][1] == ['abc', 'abd']
+    assert isinstance(leaves[0][1], tlist)
+
+    nodes = list(groups.iter_nodes())
+    assert [k for k, _ in nodes] == [(), ('a',), ('b',)]
+
+    top = list(groups.iter_leaves(max_depth=1))
+    assert [k for k, _ in top] == [('a',), ('b',)]
+    assert all(isinstance(v, NestedGroups) for _, v in top)
+
+    assert dict(groups.flatten()) == {k: v for k, v in leaves}
+    assert groups.to_dict() == {'a': {'b': ['abc', 'abd'], 'e': ['aef']}, 'b': {'c': ['bcd'], 'e': ['bef']}}
+
+    # deeper than the recursion limit
+    depth = sys.getrecursionlimit() + 100
+    deep = tcollections.groupby_multi(range(10), lambda x: (x % 2,) + (0,) * depth)
+    assert [len(k) for k in deep.flatten()] == [depth + 1, depth + 1]
+    assert deep.get_collection_type() is tlist
+    assert sorted(deep.ungroup()) == list(range(10))
+    print("✓ NestedGroups traversal test passed!")
+
+def test_agg_many():
+    """Test computing several aggregations in one pass."""
+    from tcollections import aggregators
+    groups = tcollections.groupby(range(10), lambda x: x % 2)
+    result = groups.agg_many({
+        'n': len,
+        'total': sum,
+        'mean': aggregators.mean(),
+        'min': min,
+        'max': max,
+        'distinct': aggregators.distinct(lambda x: x % 3),
+        'first': lambda g: g[0],
+    })
+    assert result == {
+        'key': [0, 1],
+        'n': [5, 5],
+        'total': [20, 25],
+        'mean': [4.0, 5.0],
+        'min': [0, 1],
+        'max': [8, 9],
+        'distinct': [3, 3],
+        'first': [0, 1],
+    }
+
+    # not slower than computing the aggregations separately
+    large = tcollections.groupby(range(200_000), lambda x: x % 100)
+    funcs = {'n': len, 'total': sum, 'min': min, 'max': max, 'mean': aggregators.mean(), 'distinct': aggregators.distinct()}
+    def best_time(f):
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            f()
+            times.append(time.perf_counter() - start)
+        return min(times)
+    fused = best_time(lambda: large.agg_many(funcs))
+    separate = best_time(lambda: [large.agg(f) for f in funcs.values()])
+    assert fused <= separate * 1.5
+    assert large.agg_many({'n': aggregators.count()})['n'] == [2000] * 100
+
+    nested = tcollections.groupby_multi(range(12), lambda x: (x % 2, x % 3))
+    result = nested.agg_many({'n': len, 'total': aggregators.sum(lambda x: x * 10)}, key_name='k')
+    assert result['k'] == list(nested.flatten().keys())
+    assert result['n'] == [2] * 6
+    assert sum(result['total']) == sum(range(12)) * 10
+
+    with pytest.raises(ValueError):
+        groups.agg_many({'key': len})
+    print("✓ agg_many test passed!")
+
+def test_groupby_batched():
+    """Test grouping with a key function that computes keys for a batch of elements."""
+    elements = ['abc', 'abcd', 'abb', 'abbc', 'adfg', 'bcdf', 'b']
+    batches = []
+    def batch_keys(batch):
+        batches.append(len(batch))
+        return [len(x) for x in batch]
+
+    groups = tcollections._groupby_batched(elements, batch_keys, batch_size=3)
+    assert groups == tcollections._groupby(elements, len)
+    assert batches == [3, 3, 1]
+
+    groups = tlist(elements).group.by(batch_key_func=batch_keys, batch_size=2)
+    assert groups == tlist(elements).group.by(len)
+    assert isinstance(groups[3], tlist)
+
+    multi = tcollections.groupby_multi(elements, batch_key_func=lambda b: [(x[0], len(x)) for x in b])
+    assert multi == tcollections.groupby_multi(elements, lambda x: (x[0], len(x)))
+
+    with pytest.raises(ValueError):
+        tcollections.groupby(elements, len, batch_key_func=batch_keys)
+    with pytest.raises(ValueError):
+        tcollections.groupby(elements, batch_key_func=lambda b: b[:-1])
+    print("✓ batched groupby test passed!")
+
+def test_rollup():
+    """Test hierarchical subtotals of NestedGroups."""
+    from tcollections import aggregators
+    data = [('n', 's1', 1), ('n', 's1', 2), ('n', 's2', 3), ('s', 's3', 4)]
+    groups = tcollections.groupby_multi(data, lambda r: (r[0], r[1]))
+
+    totals = groups.rollup(aggregators.sum(lambda r: r[2]), grand_total=True)
+    assert list(totals.items()) == [
+        ((), 10),
+        (('n',), 6),
+        (('n', 's1'), 3),
+        (('n', 's2'), 3),
+        (('s',), 4),
+        (('s', 's3'), 4),
+    ]
+    assert groups.rollup(len) == {('n',): 3, ('n', 's1'): 2, ('n', 's2'): 1, ('s',): 1, ('s', 's3'): 1}
+    assert groups.rollup(aggregators.max(lambda r: r[2]))[('n',)] == 3
+    assert groups.rollup(aggregators.mean(lambda r: r[2]), grand_total=True)[()] == 2.5
+    assert groups.rollup(aggregators.distinct(lambda r: r[1]))[('n',)] == 2
+
+    # leaf states come from whole-group collect (len for counts) rather than per-element updates
+    class strict_count(aggregators.count):
+        def update(self, state, element):
+            raise AssertionError('update called per element')
+    assert groups.rollup(strict_count()) == groups.rollup(len)
+
+    with pytest.raises(TypeError):
+        groups.rollup(lambda g: len(g))
+    print("✓ rollup test passed!")
+
+def test_pivot_and_crosstab():
+    """Test dense tables from two-level groupings."""
+    data = [('a', 'x', 1), ('a', 'y', 2), ('a', 'x', 3), ('b', 'y', 4)]
+    groups = tcollections.groupby_multi(data, lambda r: (r[0], r[1]))
+
+    table = groups.pivot(lambda g: sum(r[2] for r in g), fill=-1)
+    assert table.rows == ['a', 'b']
+    assert table.columns == ['x', 'y']
+    assert table.shape == (2, 2)
+    assert list(table.values) == [4.0, 2.0, -1.0, 4.0]
+    assert table.get('b', 'x') == -1
+    assert table.to_dict() == {'a': {'x': 4.0, 'y': 2.0}, 'b': {'x': -1.0, 'y': 4.0}}
+
+    counts = tlist(data).group.crosstab(lambda r: (r[0], r[1]))
+    assert counts.values.typecode == 'q'
+    assert counts.to_dict() == {'a': {'x': 2, 'y': 1}, 'b': {'x': 0, 'y': 1}}
+    assert counts.to_dict() == groups.pivot(len, typecode='q').to_dict()
+
+    with pytest.raises(ValueError):
+        tcollections.groupby_multi(data, lambda r: r).pivot(len)
+    print("✓ pivot and crosstab test passed!")
+
+def test_reorder_levels():
+    """Test rearranging the levels of NestedGroups."""
+    calls = []
+    def key(x):
+        calls.append(x)
+        return (x % 2, x % 3, x < 6)
+    groups = tcollections.groupby_multi(range(12), key)
+    assert groups.depth() == 3
+    calls.clear()
+
+    swapped = groups.swap_levels(0, 1)
+    assert calls == []
+    assert swapped[2][0][True] is groups[0][2][True]
+    assert dict(swapped.flatten()) == {(b, a, c): v for (a, b, c), v in groups.flatten().items()}
+
+    reordered = groups.reorder_levels([2, 0, 1])
+    assert reordered[False][1][0] is groups[1][0][False]
+    assert groups.reorder_levels([-1, 0, 1]) == reordered
+
+    dropped = groups.drop_level(-1)
+    assert dropped.depth() == 2
+    assert sorted(dropped[0][0]) == [0, 6]
+    assert isinstance(dropped[0][0], tlist)
+    assert sorted(groups[0][0][True]) == [0]
+
+    single = groups.drop_level(0).drop_level(0)
+    assert {k: sorted(v) for k, v in single.items()} == {True: list(range(6)), False: list(range(6, 12))}
+
+    leaves = [((0, 'a'), tlist([1])), ((0, 'b'), tlist([2])), ((0, 'a'), tlist([3])), ((0, 'a'), tlist([4]))]
+    combined = NestedGroups.from_leaves(leaves)
+    assert combined[0]['a'] == tlist([1, 3, 4])
+    assert leaves[0][1] == tlist([1])
+
+    with pytest.raises(ValueError):
+        groups.reorder_levels([0, 0, 1])
+    with pytest.raises(ValueError):
+        groups.drop_level(0).drop_level(0).drop_level(0)
+    print("✓ reorder levels test passed!")
+
+def test_groupby_capped():
+    """Test capping the number of elements kept per group."""
+    data = list(range(100))
+    first = tcollections.groupby(data, lambda x: x % 3, max_per_group=2, sample='first')
+    assert first.to_dict() == {0: [0, 3], 1: [1, 4], 2: [2, 5]}
+    assert first.totals == {0: 34, 1: 33, 2: 33}
+    assert isinstance(first[0], tlist)
+
+    last = tlist(data).group.by(batch_key_func=lambda b: [x % 3 for x in b], batch_size=7, max_per_group=2, sample='last')
+    assert last.to_dict() == {0: [96, 99], 1: [94, 97], 2: [95, 98]}
+
+    sampled = tcollections.groupby(data, lambda x: x % 3, max_per_group=5, seed=1)
+    assert sampled.to_dict() == tcollections.groupby(data, lambda x: x % 3, max_per_group=5, seed=1).to_dict()
+    assert all(len(v) == 5 and all(x % 3 == k for x in v) for k, v in sampled.items())
+    assert sampled.totals == first.totals
+
+    small = tcollections.groupby([1, 2], lambda x: x, max_per_group=3)
+    assert small.to_dict() == {1: [1], 2: [2]}
+    assert tcollections.groupby(data, lambda x: x % 3).totals is None
+
+    with pytest.raises(ValueError):
+        tcollections.groupby(data, lambda x: x, max_per_group=2, sample='middle')
+    with pytest.raises(ValueError):
+        tcollections.groupby(data, lambda x: x, sample='middle')
+    print("✓ capped groupby test passed!")
+
+def test_group_builder():
+    """Test building groups from several threads."""
+    import threading
+    builder = tcollections.GroupBuilder(lambda x: x % 3)
+    def produce(start):
+        for i in range(start, start + 1000, 2):
+            builder.add(i)
+        builder.add_many(range(start + 1, start + 1000, 2))
+    threads = [threading.Thread(target=produce, args=(i * 1000,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    groups = builder.build()
+    assert isinstance(groups, Groups)
+    assert isinstance(groups[0], tlist)
+    assert {k: sorted(v) for k, v in groups.items()} == {k: sorted(v) for k, v in tcollections.groupby(range(4000), lambda x: x % 3).items()}
+
+    multi = tcollections.GroupBuilder(lambda x: (x % 2, x % 3), multi=True)
+    multi.add_many(range(12))
+    assert multi.build() == tcollections.groupby_multi(range(12), lambda x: (x % 2, x % 3))
+    print("✓ group builder test passed!")
+
+def test_memory_usage():
+    """Test memory reports for collections and groupings."""
+    elements = tlist([[i] for i in range(100)])
+    shallow = elements.memory_usage()
+    deep = elements.memory_usage(deep=True)
+    assert shallow.containers == sys.getsizeof(elements)
+    assert shallow.elements == sum(sys.getsizeof(e) for e in elements)
+    assert deep.elements > shallow.elements
+    assert not deep.sampled
+    assert elements.memory_usage(sample_size=10).sampled
+
+    cycle = []
+    cycle.append(cycle)
+    assert tlist([cycle, cycle]).memory_usage(deep=True).elements == sys.getsizeof(cycle)
+
+    groups = tcollections.groupby_multi(['x' * i for i in range(30)], lambda s: (len(s) % 2, len(s) % 3))
+    usage = groups.memory_usage(top=2)
+    assert len(usage.levels) == 2
+    assert usage.levels[1].groups == 6
+    assert usage.levels[0].keys == sys.getsizeof(0) + sys.getsizeof(1)
+    assert usage.total == usage.keys + usage.containers + usage.elements
+    assert usage.elements == sum(sys.getsizeof(s) for s in groups.ungroup())
+    assert [k for k, _ in usage.top_groups] == [(1, 2), (0, 1)]
+    print("✓ memory usage test passed!")
+
+def test_to_frame():
+    """Test building pandas DataFrames from groups."""
+    pandas = pytest.importorskip('pandas')
+    groups = tcollections.groupby(range(6), lambda x: x % 2)
+    frame = groups.to_frame(index_names=['parity'])
+    assert frame.index.name == 'parity'
+    assert list(frame.index) == [0, 0, 0, 1, 1, 1]
+    assert list(frame['value']) == [0, 2, 4, 1, 3, 5]
+
+    nested = tcollections.groupby_multi(range(12), lambda x: (x % 2, x % 3))
+    frame = nested.to_frame({'n': len, 'total': sum})
+    assert isinstance(frame.index, pandas.MultiIndex)
+    assert list(frame.index) == list(nested.flatten().keys())
+    assert list(frame['total']) == [sum(v) for v in nested.flatten().values()]
+    assert list(nested.to_frame(len)['value']) == [2] * 6
+    assert len(nested.to_frame()) == 12
+    expected = pandas.MultiIndex.from_arrays([[a for a, _ in nested.flatten() for _ in range(2)], [b for _, b in nested.flatten() for _ in range(2)]])
+    assert nested.to_frame().index.equals(expected)
+    assert nested.to_frame(index_names=['a', 'b']).index.levels[0].dtype == 'int64'
+
+    numpy = pytest.importorskip('numpy')
+    array = tlist([1, 2, 3]).to_numpy(dtype=float)
+    assert array.dtype == numpy.float64
+    assert list(array) == [1.0, 2.0, 3.0]
+    print("✓ to_frame test passed!")
+
+def test_multi_lazy():
+    """Test lazily grouped sub-levels."""
+    calls = []
+    def level1(x):
+        calls.append(x)
+        return x % 3
+    lazy = tlist(range(12)).group.multi_lazy([lambda x: x % 2, level1, lambda x: x < 6])
+    assert list(lazy.keys()) == [0, 1]
+    assert lazy.pending == {0, 1}
+    assert calls == []
+
+    sub = lazy[0]
+    assert len(calls) == 6
+    assert lazy.pending == {1}
+    assert sub is lazy[0]
+    assert len(calls) == 6
+    assert sub[0][True] == tlist([0])
+
+    eager = tlist(range(12)).group.multi(lambda x: (x % 2, x % 3, x < 6))
+    assert lazy == eager
+    assert lazy.flatten() == eager.flatten()
+    assert lazy.depth() == 3
+    print("✓ multi_lazy test passed!")
+
+def test_multi_lazy_dict_paths():
+    """Test that dict methods group pending sub-levels instead of exposing the raw storage."""
+    def make():
+        return tlist(range(8)).group.multi_lazy([lambda x: x % 2, lambda x: x < 4])
+    eager = tlist(range(8)).group.multi(lambda x: (x % 2, x < 4))
+    assert dict(make()) == dict(eager)
+    assert {**make()} == dict(eager)
+    assert make() | {} == eager
+    assert {} | make() == dict(eager)
+    assert make().setdefault(0, None) == eager[0]
+
+    lazy = make()
+    copied = lazy.copy()
+    assert isinstance(copied, tcollections.LazyNestedGroups)
+    assert copied.pending == {0, 1}
+    assert copied == eager
+    assert lazy.pending == {0, 1}
+
+    key, value = lazy.popitem()
+    assert (key, value) == (1, eager[1])
+    assert lazy.pending == {0}
+
+    lazy.update({0: tlist([9])})
+    assert lazy.pending == set()
+    assert lazy[0] == tlist([9])
+    print("✓ multi_lazy dict paths test passed!")
+
+def test_encode_keys():
+    """Test dictionary-encoded keys for multi-level groupings."""
+    items = [('a', 'x', i) for i in range(3)] + [('b', 'x', 3), ('a', 'y', 4)]
+    encoded = tlist(items).group.multi(lambda t: (t[0], t[1]), encode_keys=True)
+    assert list(encoded.keys()) == [(0, 0), (1, 0), (0, 1)]
+    assert encoded.codec.cardinality() == [2, 2]
+    assert encoded.decode_key((1, 0)) == ('b', 'x')
+    assert encoded.get_group(('a', 'y')) == tlist([('a', 'y', 4)])
+    for missing in [('b', 'y'), ('c', 'x'), ('a',), ('a', 'x', 0)]:
+        with pytest.raises(KeyError):
+            encoded.get_group(missing)
+
+    nested = tlist(items).group.multi(lambda t: (t[0], t[1]))
+    assert encoded.decode() == nested
+    assert dict(encoded.iter_decoded()) == dict(nested.flatten())
+
+    batched = tcollections.groupby_multi(items, batch_key_func=lambda b: [(t[0], t[1]) for t in b], batch_size=2, encode_keys=True)
+    assert batched == encoded
+
+    head = encoded >> tcollections.chain.head(1)
+    assert head.codec is encoded.codec
+    assert head.get_group(('a', 'x')) == tlist([('a', 'x', 0)])
+    capped = tcollections.groupby(range(10), lambda x: x % 2, max_per_group=2, sample='first')
+    assert capped.head(1).totals == {0: 5, 1: 5}
+
+    numpy = pytest.importorskip('numpy')
+    values = numpy.arange(12)
+    encoded = tlist(values.tolist()).group.multi(batch_key_func=lambda b: numpy.stack([numpy.array(b) % 2, numpy.array(b) % 3], axis=1), batch_size=5, encode_keys=True)
+    assert encoded.decode() == tcollections.groupby_multi(range(12), lambda x: (x % 2, x % 3))
+    print("✓ encode_keys test passed!")
+
 
 if __name__ == '__main__':
     test_groupby_base()
@@ -189,3 +566,16 @@ if __name__ == '__main__':
     test_nested_groups_flatten()
     test_flatten_with_groupby()
     test_flatten_with_groupby_multi()
+    test_nested_groups_traversal()
+    test_agg_many()
+    test_groupby_batched()
+    test_rollup()
+    test_pivot_and_crosstab()
+    test_reorder_levels()
+    test_groupby_capped()
+    test_group_builder()
+    test_memory_usage()
+    test_to_frame()
+    test_multi_lazy()
+    test_multi_lazy_dict_paths()
+    test_encode_keys()
@@ -0,0 +1,56 @@
+
+import typing
+
+import json
+
+import tempfile
+
+import os
+
+import pytest
+
+import sys
+sys.path.append('../src')
+import tcollections
+from tcollections import tlist, chain, aggregators
+
+
+RECORDS = [
+    {'region': 'n', 'amount': 1},
+    {'region': 's', 'amount': 2},
+    {'region': 'n', 'amount': 3},
+]
+
+def test_from_ndjson():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'records.ndjson')
+        with open(path, 'w') as f:
+            f.write('\n'.join(json.dumps(r) for r in RECORDS) + '\n\n')
+
+        records = tlist.from_ndjson(path, chunksize=16)
+        assert isinstance(records, tlist)
+        assert records == RECORDS
+
+        src = chain.source.from_ndjson(path, chunksize=16)
+        groups = src.group.by(lambda r: r['region'])
+        assert {k: len(v) for k, v in groups.items()} == {'n': 2, 's': 1}
+
+        total = chain.source.from_ndjson(path) >> chain.map(lambda r: r['amount']) >> chain.aggregate(aggregators.sum())
+        assert total == 6
+
+def test_from_csv():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'records.csv')
+        with open(path, 'w', newline='') as f:
+            f.write('region,amount\n' + ''.join(f"{r['region']},{r['amount']}\n" for r in RECORDS))
+
+        records = tlist.from_csv(path)
+        assert records == [{'region': r['region'], 'amount': str(r['amount'])} for r in RECORDS]
+
+        src = chain.source.from_csv(path, chunksize=8)
+        assert src.map(lambda r: int(r['amount'])).agg(aggregators.mean()) == 2.0
+
+if __name__ == '__main__':
+    test_from_ndjson()
+    test_from_csv()
+
@@ -0,0 +1,68 @@
+
+import typing
+
+import pickle
+
+import multiprocessing
+
+import pytest
+
+import sys
+sys.path.append('../src')
+import tcollections
+from tcollections import tlist, tview
+
+
+def _worker_sum(handle):
+    view = handle.attach()
+    result = view.agg(sum)
+    del view
+    handle.close()
+    return result
+
+def test_tlist_to_shared():
+    data = tlist(range(100))
+    with data.to_shared() as handle:
+        view = handle.attach()
+        assert isinstance(view, tview)
+        assert view == data
+        assert view[10:13] == [10, 11, 12]
+        with pytest.raises(TypeError):
+            view._data[0] = 1
+        del view
+
+        # workers receive only the handle
+        worker_handle = pickle.loads(pickle.dumps(handle))
+        assert not worker_handle.owner
+        assert _worker_sum(worker_handle) == sum(data)
+
+        with multiprocessing.get_context('spawn').Pool(1) as pool:
+            assert pool.map(_worker_sum, [handle]) == [sum(data)]
+
+def test_groups_to_shared():
+    groups = tcollections.groupby(['a', 'bb', 1.5, 2.5], lambda x: type(x).__name__)
+    with groups.to_shared() as handle:
+        attached = handle.attach()
+        assert isinstance(attached, tcollections.Groups)
+        assert attached['str'] == ['a', 'bb']
+        assert isinstance(attached['float'], tview)
+        assert attached['float'] == [1.5, 2.5]
+        del attached
+
+    nested = tcollections.groupby_multi(range(10), lambda x: (x % 2, x % 3))
+    with nested.to_shared() as handle:
+        attached = handle.attach()
+        assert isinstance(attached, tcollections.NestedGroups)
+        assert attached.agg_many({'n': len, 's': sum}) == nested.agg_many({'n': len, 's': sum})
+        del attached
+
+    encoded = tcollections.groupby_multi(range(10), lambda x: (x % 2, x % 3), encode_keys=True)
+    with encoded.to_shared() as handle:
+        attached = handle.attach()
+        assert attached.get_group((1, 2)) == [5]
+        del attached
+
+if __name__ == '__main__':
+    test_tlist_to_shared()
+    test_groups_to_shared()
+
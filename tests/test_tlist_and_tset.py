@@ -2,6 +2,7 @@
 import typing
 
 import json
+import pickle
 
 import tempfile
 
@@ -46,6 +47,155 @@ def test_tlist():
 
     assert(len((elements + elements).to_set()) == len(elements))
 
+def test_tset_algebra():
+    a = tcollections.tset(range(10))
+    b = tcollections.tset(range(5, 15))
+    c = {7, 8, 9, 100}
+
+    for result, expected in [(a | b, set(range(15))), (a & b, set(range(5, 10))), (a - b, set(range(5))), (a ^ b, set(range(5)) | set(range(10, 15)))]:
+        assert isinstance(result, tcollections.tset)
+        assert result == expected
+
+    assert a.union_all(b, c) == set(a) | b | c
+    assert isinstance(a.union_all(b, c), tcollections.tset)
+    assert a.intersect_all(b, c) == {7, 8, 9}
+    assert isinstance(a.intersect_all(b, frozenset(c)), tcollections.tset)
+    assert a.intersect_all() == a and a.intersect_all() is not a
+
+    d = tcollections.tset(a)
+    ref = d
+    d |= c
+    d &= b
+    d -= {5}
+    d ^= {6, 1000}
+    assert d is ref
+    assert isinstance(d, tcollections.tset)
+    assert d == {7, 8, 9, 1000}
+
+def test_tlist_index():
+    records = tcollections.tlist([{'id': i, 'group': i % 3} for i in range(10)])
+    records.index_by(lambda r: r['id'], unique=True)
+    assert records.lookup(3) == {'id': 3, 'group': 0}
+    assert records.lookup_many([1, 99, 4]) == [records[1], records[4]]
+    with pytest.raises(KeyError):
+        records.lookup(99)
+    assert records.index_stats.hits == 3
+    assert records.index_stats.misses == 2
+    assert records.index_stats.builds == 1
+
+    # maintained by append, extend and item assignment
+    records.append({'id': 10, 'group': 1})
+    records.extend([{'id': 11, 'group': 2}])
+    records[0] = {'id': 100, 'group': 1}
+    assert records.lookup(10)['group'] == 1
+    assert records.lookup(11)['group'] == 2
+    assert records.lookup(100) is records[0]
+    assert records.lookup_many([0]) == []
+    with pytest.raises(ValueError):
+        records.append({'id': 10})
+    assert len(records) == 12
+    assert records.index_stats.builds == 1
+
+    # rebuilt after other changes
+    records.pop(1)
+    assert records.lookup(2) is records[1]
+    assert records.index_stats.builds == 2
+
+    # changes that would duplicate a unique key leave the list and index unchanged
+    before = list(records)
+    with pytest.raises(ValueError):
+        records.extend([{'id': 12}, {'id': 3}])
+    with pytest.raises(ValueError):
+        records.extend([{'id': 12}, {'id': 12}])
+    with pytest.raises(ValueError):
+        records.insert(0, {'id': 3})
+    with pytest.raises(ValueError):
+        records[0:2] = [{'id': 4}]
+    with pytest.raises(ValueError):
+        records *= 2
+    assert records == before
+    assert records.lookup(3)['id'] == 3
+    records[0:2] = [{'id': 0}, {'id': 2}]
+    assert records.lookup(0) is records[0]
+
+    # positions stay in list order when an element changes key
+    letters = tcollections.tlist(['a1', 'b', 'a2'])
+    letters.index_by(lambda s: s[0])
+    letters[0] = 'a3'
+    letters[1] = 'a4'
+    assert letters.lookup('a') == ['a3', 'a4', 'a2']
+    assert letters.lookup('b') == []
+    assert letters.index_stats.builds == 1
+
+    calls = []
+    def id_key(r):
+        calls.append(r)
+        return r['id']
+    ids = tcollections.tlist([{'id': 0}])
+    ids.index_by(id_key, unique=True)
+    calls.clear()
+    ids.append({'id': 1})
+    assert len(calls) == 1
+
+    # lists without an index or views keep the built-in list mutators
+    assert tcollections.tlist.append is list.append
+    assert tcollections.tlist.__setitem__ is list.__setitem__
+    assert type(letters) is not tcollections.tlist and type(letters.copy()) is tcollections.tlist
+
+    groups = tcollections.tlist(range(10))
+    key = lambda x: x % 3
+    index = groups.index_by(key)
+    assert groups.index_by(key) is index
+    assert groups.lookup(1) == [1, 4, 7]
+    assert groups.lookup(5) == []
+    assert groups.lookup_many([2, 0]) == [2, 5, 8, 0, 3, 6, 9]
+
+def test_copy_on_write():
+    a = tcollections.tlist([1, 2, 3])
+    b = tcollections.tlist([4, 5])
+
+    # copy, reverse and concatenation keep returning real tlists
+    for result in (a.copy(), a.reverse(), a + b):
+        assert type(result) is tcollections.tlist
+    assert json.loads(json.dumps(a + b)) == [1, 2, 3, 4, 5]
+    assert a.copy() == a and not a.copy() < a
+    assert (a + a) != (1, 2, 3, 1, 2, 3)
+
+    copied = a.view()
+    reversed_ = a.view(reverse=True)
+    joined = a.view() + b + reversed_
+    assert isinstance(copied, tcollections.cowlist)
+    assert not copied.is_materialized
+    assert reversed_ == [3, 2, 1]
+    assert joined == [1, 2, 3, 4, 5, 3, 2, 1]
+    assert joined[3:6] == [4, 5, 3]
+    assert joined[-1] == 1
+    assert copied != (1, 2, 3)
+    assert copied <= a and copied < [1, 2, 4]
+
+    # modifying a source copies its elements into the views first
+    a.append(9)
+    assert copied == [1, 2, 3] and copied.is_materialized
+    assert reversed_ == [3, 2, 1]
+    assert joined == [1, 2, 3, 4, 5, 3, 2, 1]
+
+    # sources with views stay tlists and build plain tlists
+    assert isinstance(a, tcollections.tlist) and type(a) is not tcollections.tlist
+    assert type(a.copy()) is tcollections.tlist and type(a.map(str)) is tcollections.tlist
+    assert type(pickle.loads(pickle.dumps(a))) is tcollections.tlist
+
+    # modifying a view copies only that view
+    view = b.view()
+    view.append(6)
+    assert view == [4, 5, 6]
+    assert b == [4, 5]
+
+    assert b.view().sort(reverse=True) == [5, 4]
+    assert (b.view() + [1]).to_set() == {1, 4, 5}
+
 if __name__ == '__main__':
     test_tlist()
+    test_tset_algebra()
+    test_tlist_index()
+    test_copy_on_write()
 